@@ -10,22 +10,37 @@ import time
 import re
 import os
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Makes Chrome run without showing a visible browser window
 options = Options()
 options.add_argument("--headless")
-driver = webdriver.Chrome(options=options)
+
+# Number of crawls (each with its own browser) running at the same time
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "4"))
 
 titles = []
+titles_lock = threading.Lock()
+
+# Adds a title unless its link was already saved, safe to call from several workers
+def add_title(entry):
+    with titles_lock:
+        if any(d.get("link") == entry["link"] for d in titles):
+            return False
+        titles.append(entry)
+        return True
 
 # ---------- GENERIC PARSER ----------
-def parse_page(url, classname):
+def parse_page(driver, url, classname):
     driver.get(url)
     time.sleep(3)
 
     folder = "alzheimers_html"
     os.makedirs(folder, exist_ok=True)
 
+    # Collects matching articles from the listing first, so it is never rendered twice
+    articles = []
     while True:
         try:
             soup = BeautifulSoup(driver.page_source, "html.parser")
@@ -39,25 +54,10 @@ def parse_page(url, classname):
 
                 if "alzheimer" in text.lower():
                     full_link = urljoin(url, href) if href else url
-                    if any(d.get("link") == full_link for d in titles):
+                    if not add_title({"title": text, "link": full_link}):
                         continue
-
-                    titles.append({"title": text, "link": full_link})
                     print("Saved:", text)
-
-                    # Save article HTML
-                    try:
-                        driver.get(full_link)
-                        time.sleep(2)
-                        safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", text[:60])
-                        html_path = os.path.join(folder, f"{safe_title}.html")
-                        with open(html_path, "w", encoding="utf-8") as f:
-                            f.write(driver.page_source)
-                    except Exception as e:
-                        print("Error saving article HTML:", e)
-
-                    driver.back()
-                    time.sleep(2)
+                    articles.append((text, full_link))
 
             if classname:
                 load_more = driver.find_element(By.CLASS_NAME, classname)
@@ -68,9 +68,21 @@ def parse_page(url, classname):
         except:
             break
 
+    # Then opens each article once to save its HTML
+    for text, full_link in articles:
+        try:
+            driver.get(full_link)
+            time.sleep(2)
+            safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", text[:60])
+            html_path = os.path.join(folder, f"{safe_title}.html")
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+        except Exception as e:
+            print("Error saving article HTML:", e)
+
 
 # ---------- IGC PHARMA ----------
-def scrape_igcpharma():
+def scrape_igcpharma(driver):
     base_url = "https://igcpharma.com/category/news/"
     folder = "igcpharma_articles"
     os.makedirs(folder, exist_ok=True)
@@ -91,7 +103,8 @@ def scrape_igcpharma():
         if not title or not href or "alzheimer" not in title.lower():
             continue
 
-        titles.append({"title": title, "link": href, "date": date, "author": "IGC Pharma"})
+        if not add_title({"title": title, "link": href, "date": date, "author": "IGC Pharma"}):
+            continue
         print("Saved:", title)
 
         driver.get(href)
@@ -159,7 +172,7 @@ def igcpharma_metadata(folder="igcpharma_articles"):
 
 
 # ---------- ASCENEURON ----------
-def scrape_asceneuron():
+def scrape_asceneuron(driver):
     base_url = "https://asceneuron.com/news-events/"
     folder = "asceneuron_articles"
     os.makedirs(folder, exist_ok=True)
@@ -211,7 +224,7 @@ def scrape_asceneuron():
         with open(html_path, "w", encoding="utf-8") as f:
             f.write(driver.page_source)
 
-        titles.append({"title": title, "link": href, "date": date, "author": author})
+        add_title({"title": title, "link": href, "date": date, "author": author})
         print("Saved:", title)
 
 
@@ -266,14 +279,31 @@ def asceneuron_metadata(folder="asceneuron_articles"):
     return metadata
 
 
+# ---------- PARALLEL RUN ----------
+# Runs a crawl with its own browser so crawls don't share a page
+def run_with_driver(crawl, *args):
+    driver = webdriver.Chrome(options=options)
+    try:
+        crawl(driver, *args)
+    except Exception as e:
+        print(f"{crawl.__name__} failed:", e)
+    finally:
+        driver.quit()
+
+
 # ---------- MAIN RUN ----------
 def main():
-    parse_page("https://aprinoia.com/news/","")
-    parse_page("https://agenebio.com/about-us/recent-news/","next.page-numbers")
-    parse_page("https://biggsinstitute.org/category/news/", "next")
-    parse_page("https://health.ucdavis.edu/alzheimers-research/news/topic/neurological-health", "")
-    scrape_igcpharma()
-    scrape_asceneuron()
+    crawls = [
+        (parse_page, "https://aprinoia.com/news/", ""),
+        (parse_page, "https://agenebio.com/about-us/recent-news/", "next.page-numbers"),
+        (parse_page, "https://biggsinstitute.org/category/news/", "next"),
+        (parse_page, "https://health.ucdavis.edu/alzheimers-research/news/topic/neurological-health", ""),
+        (scrape_igcpharma,),
+        (scrape_asceneuron,),
+    ]
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        for crawl in crawls:
+            executor.submit(run_with_driver, *crawl)
 
 
     # Save all titles
@@ -293,8 +323,7 @@ def main():
     df_meta.to_csv("asceneuron_metadata.csv", index=False)
     print("Saved asceneuron_metadata.csv")
 
-    driver.quit()
-
 
 # Run it all
-main()
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import time
 import re 
 import os
 import json 
+import atexit
 import requests
 from selenium import webdriver  
 from selenium.webdriver.chrome.options import Options
@@ -16,7 +17,25 @@ from dateutil import parser as dateparser
 # Makes Chrome run without showing visible browser window
 options = Options()
 options.add_argument("--headless")
-driver = webdriver.Chrome(options=options)
+
+# Chrome starts the first time the driver is used and closes when the program exits
+class LazyDriver:
+    def __init__(self, options):
+        self._options = options
+        self._driver = None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = webdriver.Chrome(options=self._options)
+        return getattr(self._driver, name)
+
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+driver = LazyDriver(options)
+atexit.register(driver.quit)
 
 titles = []
 
@@ -1290,4 +1309,5 @@ def main():
     driver.quit()
 
 
-main()
+if __name__ == "__main__":
+    main()
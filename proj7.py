@@ -3,39 +3,2249 @@ import time
 import re 
 import os
 import json 
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import pdfplumber
 import hashlib 
+import gzip
+import io
+import shutil
+import mmap
+import uuid
+import datetime
+import sqlite3
+import queue
+import threading
+import multiprocessing
+import asyncio
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from selenium import webdriver  
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By 
-from urllib.parse import urljoin  
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 from selenium.webdriver.support.ui import WebDriverWait 
-from selenium.webdriver.support import expected_conditions as EC  
-from bs4 import BeautifulSoup  
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from bs4 import BeautifulSoup, NavigableString, Tag
+import soupsieve as sv
 from dateutil import parser as dateparser
 
 # Makes Chrome run without showing visible browser window
 options = Options()
 options.add_argument("--headless")
-driver = webdriver.Chrome(options=options)
+# Images never matter since only page_source is kept
+options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+# Network events let each run report what was loaded and blocked
+options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+# ----- DRIVER POOL -----
+# Number of headless Chrome instances crawling at the same time
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "4"))
+
+def new_driver():
+    return webdriver.Chrome(options=options)
+
+class DriverPool:
+    # Hands out isolated Chrome instances, starting them on demand up to size
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.slots = threading.Semaphore(size)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        self.slots.acquire()
+        try:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                driver = new_driver()
+                with self.lock:
+                    self.drivers.append(driver)
+            failed = False
+            try:
+                yield driver
+            except WebDriverException:
+                failed = True
+                raise
+            finally:
+                # A driver that raised may have lost its session, so it is quit and the next acquire starts a new one
+                if failed:
+                    self.discard(driver)
+                else:
+                    self.idle.put(driver)
+        finally:
+            self.slots.release()
+
+    def discard(self, driver):
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            print("Error closing driver:", e)
+
+    def close(self):
+        with self.lock:
+            drivers, self.drivers = self.drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print("Error closing driver:", e)
+        self.idle = queue.Queue()
 
 # Saves in JSON
 def save_json(data, filename):
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
-        
+
+# ----- HTML PARSER -----
+# Backend used to parse pages: "html.parser" (slowest, the original output), "lxml", or "selectolax", which is
+# lxml with a pruning pre-pass: lexbor parses the page, drops the PRUNED_TAGS and serializes the rest, then lxml
+# builds the tree; that extra pass only pays off on pages with large scripts, styles or SVG
+HTML_PARSERS = ["html.parser", "lxml", "selectolax"]
+HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER", "html.parser")
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Never read by the extractors; JSON-LD scripts are kept for UC Davis
+PRUNED_TAGS = "script, style, noscript, svg, template, iframe"
+
+# selectolax builds its pruned tree with lxml, so it needs both
+def available_parsers():
+    parsers = ["html.parser"]
+    if lxml:
+        parsers.append("lxml")
+        if LexborHTMLParser:
+            parsers.append("selectolax")
+    return parsers
+
+# Parsers that can be used here, checked once
+AVAILABLE_PARSERS = available_parsers()
+
+def prune_html(markup):
+    tree = LexborHTMLParser(markup)
+    for node in tree.css(PRUNED_TAGS):
+        if node.tag == "script" and node.attributes.get("type") == "application/ld+json":
+            continue
+        node.decompose()
+    return tree.html
+
+# Parses HTML with the chosen backend, falling back to html.parser if it isn't installed
+# parse_only limits the tree to the regions it accepts
+def parse_html(markup, parser=None, parse_only=None):
+    parser = parser or HTML_PARSER
+    if parser not in AVAILABLE_PARSERS:
+        parser = "html.parser"
+    if parser == "selectolax":
+        return BeautifulSoup(prune_html(markup), "lxml", parse_only=parse_only)
+    return BeautifulSoup(markup, parser, parse_only=parse_only)
+
+# ----- PARTIAL PARSING -----
+# Regions each extractor reads, taken from its site's spec (see spec_regions): elements with one of these tag
+# names or classes are built with everything inside them, the rest of the page is skipped
+# When no date element gives a date, the extractor searches the whole page text, so pages without any date
+# element in their markup are parsed in full at once, and extract_site parses the others again when needed
+# Set SCRAPER_PARTIAL_PARSE=0 to always build the whole page
+PARTIAL_PARSING = os.environ.get("SCRAPER_PARTIAL_PARSE", "1") == "1"
+
+# Region filters need the ElementFilter API from beautifulsoup4 4.13+, older versions parse whole pages
+try:
+    from bs4 import ElementFilter
+except ImportError:
+    ElementFilter = None
+
+if ElementFilter:
+    class RegionFilter(ElementFilter):
+        def __init__(self, regions):
+            super().__init__()
+            self.tags = set(regions.get("tags", []))
+            self.classes = set(regions.get("classes", []))
+
+        # Only asked about tags outside the regions already being built
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            if name in self.tags:
+                return True
+            classes = (attrs or {}).get("class") or []
+            if isinstance(classes, str):
+                classes = classes.split()
+            return not self.classes.isdisjoint(classes)
+
+        # Text between regions is never read
+        def allow_string_creation(self, string):
+            return False
+
+# Tag names and classes of the elements a spec reads: its selectors (an element matching "h1.entry-title" is
+# inside the entry-title region), paragraphs, date blocks, <meta> for the author and scripts for JSON-LD
+# None when the spec reads the whole page (an author function) or has selectors that aren't tags and classes
+def spec_regions(spec):
+    if callable(spec.get("author")):
+        return None
+    selectors = list(spec.get("title", [])) + [source["selector"] for source in spec.get("date", [])]
+    selectors += [spec[key] for key in ("author_selector", "containers") if spec.get(key)]
+    tags = set(spec.get("paragraph_tags", ["p"])) if spec.get("containers") else set()
+    tags.update(spec["date_blocks"][0] if spec.get("date_blocks") else ())
+    if spec.get("author_meta"):
+        tags.add("meta")
+    if spec.get("jsonld"):
+        tags.add("script")
+    classes = set()
+    for selector in selectors:
+        for part in selector.split(","):
+            match = SIMPLE_SELECTOR.match(part.strip())
+            if not match:
+                return None
+            if match.group(2):
+                classes.add(match.group(2).split(".")[1])
+            else:
+                tags.add(match.group(1).lower())
+    return {"tags": sorted(tags), "classes": sorted(classes)}
+
+# Finds markup that can open one of the spec's date elements, like "<time" or a "post-date" class
+def date_marker(spec):
+    markers = []
+    for source in spec.get("date", []):
+        for part in source["selector"].split(","):
+            match = SIMPLE_SELECTOR.match(part.strip())
+            if not match:
+                return re.compile("")
+            if match.group(2):
+                markers.append(rf"class\s*=\s*[\"']?[^\"'>]*\b{re.escape(match.group(2).split('.')[1])}\b")
+            else:
+                markers.append(rf"<{match.group(1)}[\s/>]")
+    return re.compile("|".join(markers) or r"(?!)", re.IGNORECASE)
+
+# True when read_site_html can build only the regions of the site's pages
+def partial_site(site):
+    return bool(site_spec(site)["regions"] and PARTIAL_PARSING and ElementFilter)
+
+# Reads a saved article, building only the regions its site's extractor needs; returns the page and whether
+# it was built partially
+# A page whose date would be searched in the whole text (no date element in its markup) is built in full
+def read_site_html(site, path, markup=None):
+    markup = read_page(path) if markup is None else markup
+    spec = site_spec(site)
+    if not partial_site(site) or (spec.get("date_scan") and not spec["date_marker"].search(markup)):
+        return parse_html(markup), False
+    return parse_html(markup, parse_only=RegionFilter(spec["regions"])), True
+
+# ----- DATE SCANNER -----
+# Finds a date written in the page text when it has no date element
+MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+SHORT_MONTHS = ("Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|Aug(ust)?|"
+                "Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?")
+
+# "March 4, 2024"
+MONTH_DAY_YEAR = re.compile(rf"({MONTHS})\s+\d{{1,2}},?\s+\d{{4}}")
+# "Mar 4 2024", any case
+SHORT_MONTH_DAY_YEAR = re.compile(rf"({SHORT_MONTHS})\s+\d{{1,2}},?\s+\d{{4}}", re.IGNORECASE)
+# "March 2024", any case
+SHORT_MONTH_YEAR = re.compile(rf"({SHORT_MONTHS})\s+\d{{4}}", re.IGNORECASE)
+
+# How many text pieces after the title are checked before looking at the rest of the page
+NEAR_TITLE_STRINGS = 40
+
+# How often each strategy found the date, per site
+date_stats = {}
+date_lock = threading.Lock()
+
+def count_date_strategy(site, strategy):
+    with date_lock:
+        stats = date_stats.setdefault(site, {})
+        stats[strategy] = stats.get(strategy, 0) + 1
+
+# Visible text pieces (no scripts, styles or comments) after an element, in page order
+def strings_after(tag):
+    for element in tag.next_elements:
+        if type(element) is NavigableString:
+            yield element
+
+def search_strings(strings, pattern, limit=None):
+    for i, text in enumerate(strings):
+        if limit is not None and i >= limit:
+            break
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+    return None
+
+# Returns the first date matching one of the patterns, trying the most likely places first:
+# the text right after the title, then each text piece of the page, then the whole page text
+# (only needed when a date is split across elements); whole_text only searches the whole page text
+def find_date_text(site, soup, title_tag=None, patterns=(MONTH_DAY_YEAR,), whole_text=False):
+    for pattern in patterns:
+        if not whole_text:
+            if title_tag is not None:
+                date_text = search_strings(strings_after(title_tag), pattern, NEAR_TITLE_STRINGS)
+                if date_text:
+                    count_date_strategy(site, "near_title")
+                    return date_text
+            date_text = search_strings(soup.strings, pattern)
+            if date_text:
+                count_date_strategy(site, "page_strings")
+                return date_text
+        match = pattern.search(soup.get_text(" ", strip=True))
+        if match:
+            count_date_strategy(site, "full_text")
+            return match.group(0)
+    count_date_strategy(site, "not_found")
+    return None
+
+# Prints how each site's dates were found and parsed
+def date_report():
+    for site, stats in sorted(date_stats.items()):
+        print(f"{site}: " + ", ".join(f"{count} {strategy}" for strategy, count in sorted(stats.items())))
+    for site, stats in sorted(date_parse_stats.items()):
+        print(f"{site}: {stats['lookups']} dates, {stats['cache_hits']} cache hits, {stats['fast']} fast, "
+              f"{stats['fuzzy']} fuzzy, {stats['failed']} failed")
+
+# ----- DATE NORMALIZATION -----
+# Turns date text into YYYY-MM-DD; ISO dates and "Month D, YYYY" are read directly,
+# anything else goes through fuzzy dateutil parsing, and results are cached by the raw text
+DATE_CACHE_SIZE = 4096
+MONTH_NUMBERS = {name[:3].lower(): number for number, name in enumerate(MONTHS.split("|"), start=1)}
+
+# "2024-03-04", optionally followed by a time and timezone
+ISO_DATE = re.compile(r"\s*(\d{4})-(\d{2})-(\d{2})(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?\s*")
+# "March 4, 2024", "Mar. 4 2024"
+WRITTEN_DATE = re.compile(rf"\s*(?P<month>{SHORT_MONTHS})\.?\s+(?P<day>\d{{1,2}}),?\s+(?P<year>\d{{4}})\s*", re.IGNORECASE)
+
+date_cache = OrderedDict()
+date_cache_lock = threading.Lock()
+# Lookups, cache hits and how each new string was parsed, per site
+date_parse_stats = {}
+
+def strict_date(text):
+    match = ISO_DATE.fullmatch(text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+    else:
+        match = WRITTEN_DATE.fullmatch(text)
+        if not match:
+            return None
+        year, month, day = int(match["year"]), MONTH_NUMBERS[match["month"][:3].lower()], int(match["day"])
+    try:
+        return datetime.date(year, month, day).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+# Returns (YYYY-MM-DD or None, how it was parsed)
+def parse_date_text(text):
+    date = strict_date(text)
+    if date:
+        return date, "fast"
+    try:
+        parsed_date = dateparser.parse(text, fuzzy=True)
+    except Exception:
+        parsed_date = pd.to_datetime(text, errors="coerce")
+    if parsed_date is not None and not pd.isna(parsed_date):
+        return parsed_date.strftime("%Y-%m-%d"), "fuzzy"
+    return None, "failed"
+
+def normalize_date(site, text):
+    if not text:
+        return None
+    with date_cache_lock:
+        stats = date_parse_stats.setdefault(site, {"lookups": 0, "cache_hits": 0, "fast": 0, "fuzzy": 0, "failed": 0})
+        stats["lookups"] += 1
+        if text in date_cache:
+            date_cache.move_to_end(text)
+            stats["cache_hits"] += 1
+            return date_cache[text]
+
+    date, method = parse_date_text(text)
+    with date_cache_lock:
+        stats[method] += 1
+        date_cache[text] = date
+        if len(date_cache) > DATE_CACHE_SIZE:
+            date_cache.popitem(last=False)
+    return date
+
+# ----- PARAGRAPH CLASSIFIER -----
+# Tells which paragraphs are not article text: only numbers, only a date, a press release dateline or contact details
+# Cheap checks on the characters and words come first, so almost no paragraph reaches the date parser
+NUMBERS_ONLY = re.compile(r"[\d\s,.-]+")
+CONTACT_DETAILS = re.compile(r"\d{3}[-.\s]\d{3}[-.\s]\d{4}|[\w.+-]+@[\w-]+\.[A-Za-z]{2,}")
+LETTER_RUN = re.compile(r"[^\W\d_]+")
+# Besides letters, digits and spaces, the date parser only takes these characters without fuzzy matching
+NOT_DATE_CHARACTER = re.compile(r"[^\w\s.,;\-/':+()]|_")
+DATE_MONTHS = {word.lower() for names in dateparser.parserinfo.MONTHS for word in names}
+# Every word the date parser knows: month and weekday names, am/pm, time units, time zones, filler like "of",
+# and the words float() reads as numbers
+DATE_WORDS = {word.lower() for word in dateparser.parserinfo.JUMP + dateparser.parserinfo.PERTAIN
+              + dateparser.parserinfo.UTCZONE + list(dateparser.parserinfo.TZOFFSET)}
+DATE_WORDS |= {word.lower() for names in dateparser.parserinfo.WEEKDAYS + dateparser.parserinfo.MONTHS
+               + dateparser.parserinfo.HMS + dateparser.parserinfo.AMPM for word in names}
+DATE_WORDS |= DATE_MONTHS | {"e", "inf", "infinity", "nan"}
+
+# False when the parser would reject the text anyway: a character or a word it doesn't know
+# Short all-capital words are let through, the parser reads them as time zone names,
+# and "<month> of" is left to the parser, which skips whatever follows it
+def could_be_date(text):
+    if NOT_DATE_CHARACTER.search(text):
+        return False
+    previous = None
+    for match in LETTER_RUN.finditer(text):
+        word = match.group(0)
+        lower_word = word.lower()
+        if lower_word == "of" and previous in DATE_MONTHS:
+            return True
+        if lower_word not in DATE_WORDS and not (len(word) <= 5 and word.isascii() and word.isupper()):
+            return False
+        previous = lower_word
+    return True
+
+# The whole text is a date, read the same way as dateparser.parse(text, fuzzy=False)
+def is_date_only(text):
+    if not could_be_date(text):
+        return False
+    try:
+        dateparser.parse(text, fuzzy=False)
+        return True
+    except (ValueError, OverflowError):
+        return False
+
+# Returns the first of the kinds the paragraph is ("numbers", "date", "dateline", "contact"), or None
+# dateline is the site's pattern for the place and date opening a press release
+def paragraph_kind(text, kinds, dateline=None):
+    for kind in kinds:
+        if kind == "numbers" and NUMBERS_ONLY.fullmatch(text):
+            return kind
+        if kind == "date" and is_date_only(text):
+            return kind
+        if kind == "dateline" and dateline is not None and dateline.match(text):
+            return kind
+        if kind == "contact" and CONTACT_DETAILS.search(text):
+            return kind
+    return None
+
+# ----- CLEANUP ENGINE -----
+# Each site's cleanup rules are compiled into one pattern, so a text is scanned once for all of them;
+# drop rules are the exception and run after the scan as one re.sub each, in order, since removing one match
+# can make a new one (a date right after "Read More" only starts at a word boundary once that is gone)
+# A rule is (kind, pattern[, flags]):
+#   prefix  drop the match at the start of the text; prefix rules apply one after another
+#   reject  drop the whole text (a paragraph) when the pattern is found
+#   cut     the text ends where the pattern is found
+#   line    drop from the match to the end of its line
+#   drop    drop the match
+# Matches are handled left to right; a cut inside a dropped line still ends the text
+CLEANUP_KINDS = ("prefix", "reject", "cut", "line", "drop")
+
+# How often each rule fired, per site
+cleanup_stats = {}
+cleanup_lock = threading.Lock()
+
+def rule_label(kind, pattern):
+    return f"{kind} {pattern if len(pattern) <= 40 else pattern[:37] + '...'}"
+
+def scoped_pattern(name, pattern, flags):
+    scope = ("i" if flags & re.IGNORECASE else "") + ("s" if flags & re.DOTALL else "") + ("m" if flags & re.MULTILINE else "")
+    return f"(?P<{name}>(?{scope}:{pattern}))" if scope else f"(?P<{name}>{pattern})"
+
+def compile_cleanup(rules):
+    labels, kinds, prefixes, alternatives, drops = {}, {}, [], [], []
+    for i, (kind, pattern, *flags) in enumerate(rules):
+        if kind not in CLEANUP_KINDS:
+            raise ValueError(f"Unknown cleanup rule kind: {kind}")
+        name = f"rule{i}"
+        labels[name] = rule_label(kind, pattern)
+        kinds[name] = kind
+        group = scoped_pattern(name, pattern, flags[0] if flags else 0)
+        if kind == "prefix":
+            prefixes.append(group + "?")
+        elif kind == "drop":
+            drops.append((name, re.compile(pattern, flags[0] if flags else 0)))
+        else:
+            alternatives.append(group)
+    return {
+        "labels": labels,
+        "kinds": kinds,
+        "prefix": re.compile("".join(prefixes)) if prefixes else None,
+        "scan": re.compile("|".join(alternatives)) if alternatives else None,
+        "drops": drops,
+    }
+
+# Returns the cleaned text, or None when a reject rule matched
+def run_cleanup(site, cleanup, text):
+    hits = []
+    if cleanup["prefix"] is not None:
+        match = cleanup["prefix"].match(text)
+        if match.end():
+            hits += [name for name, value in match.groupdict().items() if value is not None]
+            text = text[match.end():]
+
+    if cleanup["scan"] is not None:
+        kinds = cleanup["kinds"]
+        kept = []
+        pos = 0
+        for match in cleanup["scan"].finditer(text):
+            kind = kinds[match.lastgroup]
+            # Already dropped with the line of an earlier match
+            if match.start() < pos and kind != "cut":
+                continue
+            hits.append(match.lastgroup)
+            if kind == "reject":
+                text = None
+                break
+            if kind == "cut":
+                kept.append(text[pos:max(pos, match.start())])
+                pos = len(text)
+                break
+            kept.append(text[pos:match.start()])
+            end = text.find("\n", match.end())
+            pos = end if end != -1 else len(text)
+        if text is not None and hits:
+            kept.append(text[pos:])
+            text = "".join(kept)
+
+    if text is not None:
+        for name, pattern in cleanup["drops"]:
+            text, count = pattern.subn("", text)
+            hits += [name] * count
+
+    if hits:
+        with cleanup_lock:
+            stats = cleanup_stats.setdefault(site, {})
+            for name in hits:
+                label = cleanup["labels"][name]
+                stats[label] = stats.get(label, 0) + 1
+    return text
+
+# Prints how often each site's cleanup rules fired, rules that never fired included
+def cleanup_report():
+    for site, spec in SITE_SPECS.items():
+        rules = spec.get("paragraph_filter", []) + spec.get("content_filter", [])
+        if not rules:
+            continue
+        stats = cleanup_stats.get(site, {})
+        labels = dict.fromkeys(rule_label(kind, pattern) for kind, pattern, *flags in rules)
+        print(f"{site}: " + ", ".join(f"{stats.get(label, 0)} {label}" for label in labels))
+
+# ----- EXTRACTION ENGINE -----
+# Each site's extraction is described as data in SITE_SPECS (next to the site's scraper) and run by extract_site
+# Selectors and regexes are compiled the first time a site is extracted in a process
+#
+# Spec keys:
+#   file_key          "file" or "filename", the key holding the saved file's name
+#   title             selectors tried in order, the first match gives the title
+#   title_skip_empty  keep looking when a matched title is empty
+#   title_default     "name", "name_spaces" (underscores become spaces), "basename" or None when nothing matches
+#   title_hook        fn(title, path) that fixes up the title
+#   jsonld            use the page's JSON-LD article data when present
+#   date              sources tried in order: {"selector", "attr" (read before the text), "text", "separator"}
+#   date_retry        try the next source when a date doesn't parse
+#   date_blocks       (tags, pattern): first of these elements whose text matches is the date
+#   date_scan         patterns for find_date_text when no source gave a date
+#   date_scan_text    search only the whole page text with date_scan, not the text near the title first
+#   date_clean        rules applied to the date text before it is parsed
+#   normalize_date    False keeps the date text as written
+#   author_meta       read <meta name="author"> first
+#   author_selector   element holding the author
+#   author            default author, or fn(soup)
+#   containers        where the paragraphs are; None skips content (ABScience reads its PDF)
+#   container_mode    "first" container or "all" matching containers
+#   page_fallback     use every paragraph of the page when the containers give none
+#   paragraph_tags    elements read as paragraphs
+#   paragraph_filter  cleanup rules run on each paragraph before paragraph_rules, see CLEANUP ENGINE
+#   paragraph_rules   rules applied to each paragraph
+#   keep_paragraph    fn(text), False drops the paragraph
+#   drop_paragraphs   paragraph kinds that are dropped, see paragraph_kind
+#   dateline          the site's dateline pattern for the "dateline" kind
+#   dedupe            drop repeated paragraphs
+#   join              separator between paragraphs
+#   content_filter    cleanup rules run on the joined content before cleanup
+#   cleanup           rules applied to the joined content
+#   truncate          content length limit; empty content becomes None
+# A rule is (pattern, replacement[, flags]) or a function taking and returning the text
+#
+# Keys the rest of the scraper reads, so a new site only needs its SITE_SPECS entry:
+#   name              printed once the site's JSON Lines file is saved
+#   discover          fn(driver) returning the site's article jobs, see LINK DISCOVERY
+#   discover_rank     discovery starts in this order, slowest sites first; sites without one start last
+#   save_page         fn(job, html) run on a fetched article instead of save_article
+#   extract           fn(path, soup=None) used instead of extract_site for saved pages
+#   fetch_record      fn(result) giving the record of a save_page result; the site's metadata is written from
+#                     this run's fetch results, so its articles are always fetched
+#   unique_titles     keep only the first article of each title, ignoring case and spacing ("exact": as written)
+# Saved pages are in <site>_articles
+#
+# Every element a spec reads is collected in one walk over the page (walk_page); with
+# SCRAPER_SINGLE_PASS=0 each field is found with its own search instead
+SITE_SPECS = {}
+compiled_specs = {}
+
+DATELINE_PREFIX = r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?"
+DATE_SELECTOR = "time, .post-date, .entry-date, .elementor-post-date"
+AUTHOR_SELECTOR = ".author, .byline, .post-author, .entry-author"
+# Month name followed by a year somewhere later in the text
+MONTH_AND_YEAR = re.compile(rf"({MONTHS}).*\d{{4}}")
+SINGLE_PASS = os.environ.get("SCRAPER_SINGLE_PASS", "1") == "1"
+# A tag name and/or classes: "h1", ".post-date", "p.news__title.textP"
+SIMPLE_SELECTOR = re.compile(r"^([A-Za-z][A-Za-z0-9]*)?((?:\.[\w-]+)*)$")
+
+def replace_dashes(text):
+    return text.replace("–", "-").replace("—", "-").strip()
+
+def compile_rules(rules):
+    compiled = []
+    for rule in rules:
+        if callable(rule):
+            compiled.append(rule)
+        else:
+            pattern, replacement, *flags = rule
+            compiled.append((re.compile(pattern, *flags), replacement))
+    return compiled
+
+def apply_rules(text, rules):
+    for rule in rules:
+        text = rule(text) if callable(rule) else rule[0].sub(rule[1], text)
+    return text
+
+def compile_spec(site, spec):
+    compiled = dict(spec, site=site)
+    compiled["title"] = [sv.compile(selector) for selector in spec.get("title", [])]
+    compiled["date"] = [dict(source, selector=sv.compile(source["selector"])) for source in spec.get("date", [])]
+    compiled["date_clean"] = compile_rules(spec.get("date_clean", []))
+    compiled["paragraph_rules"] = compile_rules(spec.get("paragraph_rules", []))
+    compiled["cleanup"] = compile_rules(spec.get("cleanup", []))
+    compiled["paragraph_filter"] = compile_cleanup(spec.get("paragraph_filter", []))
+    compiled["content_filter"] = compile_cleanup(spec.get("content_filter", []))
+    if spec.get("author_selector"):
+        compiled["author_selector"] = sv.compile(spec["author_selector"])
+    if spec.get("containers"):
+        compiled["containers"] = sv.compile(spec["containers"])
+    compiled["dispatch"] = compile_dispatch(spec)
+    compiled["regions"] = spec_regions(spec)
+    compiled["date_marker"] = date_marker(spec)
+    return compiled
+
+# Tables of the fields each element can belong to, looked up by the element's tag name and classes
+# Selectors that are not tag names and classes are checked on every element with soupsieve
+def compile_dispatch(spec):
+    by_name, by_class, others = {}, {}, []
+
+    def add(field, selector, attr=None):
+        for part in selector.split(","):
+            part = part.strip()
+            match = SIMPLE_SELECTOR.match(part)
+            if not part or not match:
+                others.append((field, sv.compile(part)))
+                continue
+            name = match.group(1).lower() if match.group(1) else None
+            classes = match.group(2).split(".")[1:]
+            if classes:
+                by_class.setdefault(classes[0], []).append((field, name, frozenset(classes), attr))
+            else:
+                by_name.setdefault(name, []).append((field, None, frozenset(), attr))
+
+    for i, selector in enumerate(spec.get("title", [])):
+        add(("title", i), selector)
+    for i, source in enumerate(spec.get("date", [])):
+        add(("date", i), source["selector"])
+    if spec.get("author_selector"):
+        add("author", spec["author_selector"])
+    if spec.get("author_meta"):
+        add("meta_author", "meta", ("name", "author"))
+    if spec.get("jsonld"):
+        add("jsonld", "script", ("type", "application/ld+json"))
+    if spec.get("date_blocks"):
+        for name in spec["date_blocks"][0]:
+            add("date_block", name)
+    if spec.get("containers"):
+        add("container", spec["containers"])
+        for name in spec.get("paragraph_tags", ["p"]):
+            add("paragraph", name)
+    return by_name, by_class, others
+
+def site_spec(site):
+    spec = compiled_specs.get(site)
+    if spec is None:
+        spec = compiled_specs[site] = compile_spec(site, SITE_SPECS[site])
+    return spec
+
+def site_folder(site):
+    return f"{site}_articles"
+
+# Record of a saved page of a site
+def extract_article(site, path, soup=None):
+    extract = SITE_SPECS[site].get("extract")
+    return extract(path, soup) if extract else extract_site(site, path, soup)
+
+# Record built from the page's JSON-LD article data, None when it has none or it can't be read
+def jsonld_record(spec, soup, path, found=None):
+    jsonld_tag = found["jsonld"] if found else soup.find("script", type="application/ld+json")
+    if not jsonld_tag:
+        return None
+    try:
+        data = json.loads(jsonld_tag.string)
+        if not isinstance(data, dict):
+            return None
+        author = None
+        author_data = data.get("author")
+        if isinstance(author_data, dict):
+            author = author_data.get("name")
+        elif isinstance(author_data, list) and len(author_data) > 0:
+            author = author_data[0].get("name")
+        return {
+            spec["file_key"]: os.path.basename(path),
+            "title": data.get("headline"),
+            "date": data.get("datePublished"),
+            "author": author,
+            "content": data.get("description"),
+            "content_source": "jsonld",
+        }
+    except Exception:
+        return None
+
+def default_title(spec, path):
+    name = os.path.basename(path)
+    default = spec.get("title_default", "name")
+    if default == "name":
+        return name.replace(".html", "")
+    if default == "name_spaces":
+        return name.replace(".html", "").replace("_", " ")
+    if default == "basename":
+        return name
+    return None
+
+# Returns the first title element (dates are looked for near it) and the title text
+def find_title(spec, soup, path, found=None):
+    title_tag = None
+    for i, selector in enumerate(spec["title"]):
+        tag = found["title"][i] if found else selector.select_one(soup)
+        if tag is None:
+            continue
+        if title_tag is None:
+            title_tag = tag
+        title = tag.get_text(strip=True)
+        if title or not spec.get("title_skip_empty"):
+            break
+    else:
+        title = default_title(spec, path)
+
+    if spec.get("title_hook"):
+        title = spec["title_hook"](title, path)
+    return title_tag, title
+
+# Returned by find_date instead of scanning a partial tree, which lacks the text outside the regions
+FULL_PAGE = object()
+
+def find_date(site, spec, soup, title_tag, found=None, partial=False):
+    def finish(text):
+        text = apply_rules(text, spec["date_clean"])
+        return normalize_date(site, text) if spec.get("normalize_date", True) else text
+
+    for i, source in enumerate(spec["date"]):
+        tag = found["date"][i] if found else source["selector"].select_one(soup)
+        if tag is None:
+            continue
+        text = tag.get(source["attr"]) if source.get("attr") else None
+        if not text and source.get("text", True):
+            text = tag.get_text(source.get("separator", ""), strip=True)
+        if not text:
+            # Dates kept as written stay empty, like the element
+            if not spec.get("normalize_date", True):
+                return text
+            continue
+        if not spec.get("date_retry"):
+            return finish(text)
+        date = finish(text)
+        if date:
+            return date
+
+    if spec.get("date_blocks"):
+        tags, pattern = spec["date_blocks"]
+        for tag in (found["date_blocks"] if found else soup.find_all(tags)):
+            text = tag.get_text(" ", strip=True)
+            if pattern.search(text):
+                return finish(text)
+
+    if spec.get("date_scan"):
+        if partial:
+            return FULL_PAGE
+        text = find_date_text(site, soup, title_tag, spec["date_scan"], spec.get("date_scan_text", False))
+        if text:
+            return finish(text)
+    return None
+
+def find_author(spec, soup, found=None):
+    if spec.get("author_meta"):
+        meta_author = found["meta_author"] if found else soup.find("meta", attrs={"name": "author"})
+        if meta_author and meta_author.get("content"):
+            return meta_author["content"]
+    if spec.get("author_selector"):
+        author_tag = found["author"] if found else spec["author_selector"].select_one(soup)
+        if author_tag:
+            return author_tag.get_text(strip=True)
+    author = spec["author"]
+    return author(soup) if callable(author) else author
+
+def paragraphs_in(spec, root):
+    return root.find_all(spec.get("paragraph_tags", ["p"]))
+
+def paragraph_texts(paragraphs):
+    texts = []
+    for p in paragraphs:
+        text = p.get_text(" ", strip=True)
+        if text:
+            texts.append(text)
+    return texts
+
+def clean_paragraphs(spec, texts):
+    keep = spec.get("keep_paragraph")
+    drop = spec.get("drop_paragraphs")
+    dedupe = spec.get("dedupe")
+    paragraphs = []
+    seen = set()
+    for text in texts:
+        text = run_cleanup(spec["site"], spec["paragraph_filter"], text)
+        if text is None:
+            continue
+        text = apply_rules(text, spec["paragraph_rules"])
+        if not text or (keep and not keep(text)):
+            continue
+        if drop and paragraph_kind(text, drop, spec.get("dateline")):
+            continue
+        if dedupe:
+            if text in seen:
+                continue
+            seen.add(text)
+        paragraphs.append(text)
+    return paragraphs
+
+def find_content(spec, soup, found=None):
+    first_only = spec.get("container_mode", "first") == "first"
+    if found:
+        groups = found["container_paragraphs"]
+        page = found["page_paragraphs"]
+    else:
+        containers = [spec["containers"].select_one(soup)] if first_only else spec["containers"].select(soup)
+        groups = [paragraphs_in(spec, container) for container in containers if container is not None]
+        page = None
+
+    texts = paragraph_texts(p for group in groups for p in group)
+    # "first" falls back to the page only without a container, "all" also when the containers have no text
+    if spec.get("page_fallback") and (not groups if first_only else not texts):
+        texts = paragraph_texts(page if page is not None else paragraphs_in(spec, soup))
+    paragraphs = clean_paragraphs(spec, texts)
+
+    content = spec.get("join", "\n").join(paragraphs)
+    content = run_cleanup(spec["site"], spec["content_filter"], content)
+    content = apply_rules(content, spec["cleanup"])
+    if spec.get("truncate"):
+        return content[:spec["truncate"]] if content else None
+    return content
+
+# Walks the page once and hands each element to the fields whose selectors it matches
+# Each field keeps the first matching element, like select_one; containers keep the paragraphs inside them,
+# so nested containers list a paragraph once for each, like select() followed by find_all()
+def walk_page(spec, soup):
+    by_name, by_class, others = spec["dispatch"]
+    first_only = spec.get("container_mode", "first") == "first"
+    firsts = {}
+    date_blocks = []
+    groups = []
+    page = [] if spec.get("page_fallback") else None
+
+    stack = [(child, ()) for child in reversed(soup.contents) if isinstance(child, Tag)]
+    while stack:
+        tag, inside = stack.pop()
+        fields = set()
+        for field, name, classes, attr in by_name.get(tag.name, ()):
+            if attr is None or tag.get(attr[0]) == attr[1]:
+                fields.add(field)
+        if by_class:
+            tag_classes = tag.get("class") or ()
+            if isinstance(tag_classes, str):
+                tag_classes = tag_classes.split()
+            for tag_class in tag_classes:
+                for field, name, classes, attr in by_class.get(tag_class, ()):
+                    if (name is None or name == tag.name) and classes.issubset(tag_classes):
+                        fields.add(field)
+        for field, selector in others:
+            if selector.match(tag):
+                fields.add(field)
+
+        child_inside = inside
+        for field in fields:
+            if field == "paragraph":
+                for i in inside:
+                    groups[i].append(tag)
+                if page is not None:
+                    page.append(tag)
+            elif field == "container":
+                if not (first_only and groups):
+                    child_inside = inside + (len(groups),)
+                    groups.append([])
+            elif field == "date_block":
+                date_blocks.append(tag)
+            elif field not in firsts:
+                firsts[field] = tag
+
+        children = [(child, child_inside) for child in tag.contents if isinstance(child, Tag)]
+        children.reverse()
+        stack += children
+
+    return {
+        "title": [firsts.get(("title", i)) for i in range(len(spec["title"]))],
+        "date": [firsts.get(("date", i)) for i in range(len(spec["date"]))],
+        "author": firsts.get("author"),
+        "meta_author": firsts.get("meta_author"),
+        "jsonld": firsts.get("jsonld"),
+        "date_blocks": date_blocks,
+        "container_paragraphs": groups,
+        "page_paragraphs": page,
+    }
+
+# Extracts title, date, author and content from a saved article as its site's spec describes
+# partial tells that soup was built by read_site_html with only the site's regions
+def extract_site(site, path, soup=None, partial=False):
+    spec = site_spec(site)
+    markup = None
+    if soup is None:
+        markup = read_page(path)
+        soup, partial = read_site_html(site, path, markup)
+
+    found = walk_page(spec, soup) if SINGLE_PASS else None
+
+    if spec.get("jsonld"):
+        record = jsonld_record(spec, soup, path, found)
+        if record is not None:
+            return record
+
+    title_tag, title = find_title(spec, soup, path, found)
+    date = find_date(site, spec, soup, title_tag, found, partial)
+    if date is FULL_PAGE:
+        return extract_site(site, path, parse_html(read_page(path) if markup is None else markup))
+    author = find_author(spec, soup, found)
+    content = find_content(spec, soup, found) if spec.get("containers") else None
+
+    return {
+        spec["file_key"]: os.path.basename(path),
+        "title": title,
+        "date": date,
+        "author": author,
+        "content": content,
+        "content_source": "html",
+    }
+
+# ----- WAIT ENGINE -----
+# Waits until a page is usable instead of sleeping a fixed time
+WAIT_TIMEOUT = 15
+DOM_QUIET_MS = 500
+NETWORK_IDLE_MS = 750
+# Without a load-more button nothing tells that a list ended, so a "grows" wait gives up this soon and the
+# list is taken as complete (like the 2s pause the scroll loops used to make)
+END_OF_LIST_TIMEOUT = 2
+
+# Readiness condition per site and page kind: ("selector", css), ("dom_quiet", None) or ("network_idle", None)
+# "more" is used after clicking load-more / next buttons or scrolling: ("grows", (items css, button css)) waits
+# until more items match (or the page got taller, without items css) or the load-more button is gone;
+# without a button, a wait that runs out after END_OF_LIST_TIMEOUT means the list ended, not a timeout
+SITE_WAITS = {
+    "igcpharma": {"listing": ("selector", "article"), "detail": ("selector", "article, .elementor-post, .entry-content, main")},
+    "asceneuron": {"listing": ("selector", "div.df-item-wrap.df-cpt-title-wrap a"), "detail": ("selector", "h1, .entry-title"),
+                   "more": ("grows", ("div.df-item-wrap.df-cpt-title-wrap a", ".df-cptfilter-load-more"))},
+    "aprinoia": {"listing": ("selector", "h2 a, h3 a, .elementor-post__title a"), "detail": ("selector", "h1")},
+    "ucdavis": {"listing": ("dom_quiet", None), "detail": ("selector", ".article-body, .news-body, div.text-body, div.parsys"),
+                "more": ("grows", (None, None))},
+    "agenebio": {"listing": ("selector", "h2 a, h3 a"), "detail": ("selector", "h1")},
+    "usc": {"listing": ("selector", "h2 a, h3 a, a[href*='/news/']"), "detail": ("selector", "h1")},
+    "teikoku": {"listing": ("selector", "a[href*='/company/news-press/'][title]"), "detail": ("selector", "h1.entry-title")},
+    "treeway": {"listing": ("selector", "div.elementor-post__text a, article a"), "detail": ("selector", "div.elementor-post-content, div.entry-content")},
+    "annovis": {"listing": ("selector", "h5.blog-post-title"), "detail": ("selector", "div.blog-post-content, article, main")},
+    "stanford": {"listing": ("network_idle", None), "detail": ("network_idle", None)},
+    "eisai": {"listing": ("selector", "a.list-news-link"), "detail": ("selector", "h1, .news-title")},
+    "abscience": {"listing": ("selector", "h3.entry-title a"), "detail": ("selector", "h1.entry-title")},
+    "inmunebio": {"listing": ("selector", "p.news__title.textP"), "detail": ("selector", "article, main, .content, .news-detail")},
+    "vandria": {"listing": ("selector", "a.title"), "detail": ("selector", "h1, h2, .entry-title, .et_pb_title")},
+    "priavoid": {"listing": ("selector", "h3"), "detail": ("selector", "h1, h2, h3, .entry-title")},
+}
+
+# Seconds spent in each wait, per site
+wait_times = {}
+wait_lock = threading.Lock()
+
+class dom_is_quiet:
+    # True once the document is loaded and the element count stops changing
+    def __init__(self, quiet_ms=DOM_QUIET_MS):
+        self.quiet = quiet_ms / 1000
+        self.last_count = None
+        self.last_change = time.perf_counter()
+
+    def __call__(self, driver):
+        state, count = driver.execute_script(
+            "return [document.readyState, document.getElementsByTagName('*').length];"
+        )
+        now = time.perf_counter()
+        if state != "complete" or count != self.last_count:
+            self.last_count = count
+            self.last_change = now
+            return False
+        return now - self.last_change >= self.quiet
+
+class network_is_idle:
+    # True once the document is loaded and no new resources finished loading for quiet_ms
+    def __init__(self, quiet_ms=NETWORK_IDLE_MS):
+        self.quiet = quiet_ms / 1000
+        self.last_count = None
+        self.last_change = time.perf_counter()
+
+    def __call__(self, driver):
+        state, count = driver.execute_script(
+            "return [document.readyState, performance.getEntriesByType('resource').length];"
+        )
+        now = time.perf_counter()
+        if state != "complete" or count != self.last_count:
+            self.last_count = count
+            self.last_change = now
+            return False
+        return now - self.last_change >= self.quiet
+
+# Number of items matching css, or the page height without css
+def page_progress(driver, site, kind="more"):
+    _, (items, _) = SITE_WAITS[site][kind]
+    return driver.execute_script(
+        "return arguments[0] ? document.querySelectorAll(arguments[0]).length : document.body.scrollHeight;", items
+    )
+
+class page_grew:
+    # True once page_progress is past the value measured before the click or scroll, or the button is gone
+    def __init__(self, site, kind, baseline):
+        self.site = site
+        self.kind = kind
+        self.baseline = baseline
+        self.button = SITE_WAITS[site][kind][1][1]
+
+    def __call__(self, driver):
+        if page_progress(driver, self.site, self.kind) > self.baseline:
+            return True
+        return bool(self.button) and not driver.find_elements(By.CSS_SELECTOR, self.button)
+
+def page_condition(mode, selector=None):
+    if mode == "selector":
+        return EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+    if mode == "network_idle":
+        return network_is_idle()
+    return dom_is_quiet()
+
+# Blocks until the page matches the site's readiness condition and records how long it took
+# "grows" waits need the page_progress measured before the click or scroll as baseline
+def wait_for_page(driver, site, kind="detail", timeout=WAIT_TIMEOUT, baseline=None):
+    mode, selector = SITE_WAITS.get(site, {}).get(kind, ("dom_quiet", None))
+    condition = page_grew(site, kind, baseline) if mode == "grows" else page_condition(mode, selector)
+    end_of_list = mode == "grows" and not selector[1]
+    if end_of_list:
+        timeout = min(timeout, END_OF_LIST_TIMEOUT)
+    start = time.perf_counter()
+    ready = True
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+    except TimeoutException:
+        ready = False
+        if not end_of_list:
+            print(f"Timeout waiting for {kind} page ({mode}) on {site}: {driver.current_url}")
+    elapsed = round(time.perf_counter() - start, 3)
+    wait = {"kind": kind, "mode": mode, "seconds": elapsed, "ready": ready}
+    if end_of_list and not ready:
+        wait["end_of_list"] = True
+    with wait_lock:
+        wait_times.setdefault(site, []).append(wait)
+    return ready
+
+# Prints per-site wait totals and saves every recorded wait
+def wait_report(filename="wait_times.json"):
+    for site, waits in sorted(wait_times.items()):
+        total = sum(w["seconds"] for w in waits)
+        timeouts = sum(1 for w in waits if not w["ready"] and not w.get("end_of_list"))
+        print(f"{site}: {len(waits)} waits, {total:.1f}s total, "
+              f"{total / len(waits):.2f}s avg, {timeouts} timeouts")
+    save_json(wait_times, filename)
+
+# ----- LEAN BROWSER PROFILE -----
+# URL patterns blocked in Chrome through DevTools (Network.setBlockedURLs)
+BLOCKED_RESOURCES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*use.typekit.net*"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8", "*.mov", "*youtube.com/embed*", "*player.vimeo.com*"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*connect.facebook.net*",
+        "*hotjar.com*", "*hs-analytics.net*", "*hs-scripts.com*", "*snap.licdn.com*", "*clarity.ms*",
+        "*cookielaw.org*", "*siteimproveanalytics.com*", "*newrelic.com*", "*nr-data.net*",
+    ],
+    "scripts": ["*.js", "*.js?*"],
+}
+
+# Everything is blocked by default; sites whose content is rendered by their own scripts keep them, and so
+# does a page loaded in Chrome because its HTTP fetch failed, since it may need them to render
+DEFAULT_BLOCK_PROFILE = ["images", "fonts", "media", "trackers", "scripts"]
+SCRIPT_SITES = {"ucdavis", "asceneuron", "stanford"}
+
+# Requests and bytes loaded or blocked, per site, with the blocked requests counted by resource type
+resource_stats = {}
+# Requests and bytes loaded per resource type on every site; a blocked request is counted as the
+# average size of the loaded ones of its type, since Chrome never sees the size of a blocked response
+type_sizes = {}
+resource_lock = threading.Lock()
+
+def block_profile(site, scripts=False):
+    if scripts or site in SCRIPT_SITES:
+        return [group for group in DEFAULT_BLOCK_PROFILE if group != "scripts"]
+    return DEFAULT_BLOCK_PROFILE
+
+# Pooled drivers move between sites, so the profile is set before every navigation
+def apply_block_profile(driver, site, scripts=False):
+    patterns = [p for group in block_profile(site, scripts) for p in BLOCKED_RESOURCES[group]]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+# Reads the network events since the last call and adds them to the site's totals
+def record_resources(driver, site):
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return
+    types = {}
+    loaded = {}
+    blocked = {}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message["method"] == "Network.requestWillBeSent":
+            types[params["requestId"]] = params.get("type", "Other")
+        elif message["method"] == "Network.loadingFinished":
+            counts = loaded.setdefault(types.get(params["requestId"], "Other"), [0, 0])
+            counts[0] += 1
+            counts[1] += params.get("encodedDataLength", 0)
+        elif message["method"] == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = params.get("type") or types.get(params["requestId"], "Other")
+            blocked[resource_type] = blocked.get(resource_type, 0) + 1
+    with resource_lock:
+        stats = resource_stats.setdefault(site, {"requests": 0, "bytes": 0, "blocked": 0, "blocked_types": {}})
+        for resource_type, (count, size) in loaded.items():
+            stats["requests"] += count
+            stats["bytes"] += size
+            totals = type_sizes.setdefault(resource_type, [0, 0])
+            totals[0] += count
+            totals[1] += size
+        for resource_type, count in blocked.items():
+            stats["blocked"] += count
+            stats["blocked_types"][resource_type] = stats["blocked_types"].get(resource_type, 0) + count
+
+# Navigates with the site's blocking profile, waits for the page and records its traffic
+def browser_get(driver, site, url, kind="detail", scripts=False):
+    apply_block_profile(driver, site, scripts)
+    driver.get(url)
+    wait_for_page(driver, site, kind)
+    record_resources(driver, site)
+
+# Bytes the site's blocked requests would have loaded, estimated from the loaded requests of each type,
+# and how many blocked requests are of a type nothing was loaded of
+def blocked_bytes(stats):
+    saved = unknown = 0
+    for resource_type, count in stats["blocked_types"].items():
+        loaded, size = type_sizes.get(resource_type, (0, 0))
+        if loaded:
+            saved += count * size / loaded
+        else:
+            unknown += count
+    return saved, unknown
+
+# Prints requests and bytes loaded and saved per site
+def resource_report():
+    for site, stats in sorted(resource_stats.items()):
+        saved, unknown = blocked_bytes(stats)
+        unsized = f" ({unknown} of a type never loaded)" if unknown else ""
+        print(f"{site}: {stats['requests']} requests ({stats['bytes'] / 1024:.0f} KB) loaded, "
+              f"{stats['blocked']} requests blocked, about {saved / 1024:.0f} KB saved{unsized}")
+
+# ----- HTTP FETCH -----
+# Pages are fetched with a plain keep-alive HTTP session unless the site needs a browser
+HTTP_TIMEOUT = 15
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# "js" pages are loaded in Chrome (scrolling, load-more buttons, client-side rendering)
+# Anything not listed here is fetched over HTTP
+SITE_FETCH_MODE = {
+    "ucdavis": {"listing": "js", "detail": "js"},
+    "asceneuron": {"listing": "js", "detail": "http"},
+    "stanford": {"listing": "js", "detail": "js"},
+}
+
+def fetch_mode(site, kind="detail"):
+    return SITE_FETCH_MODE.get(site, {}).get(kind, "http")
+
+def new_http_session():
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=POOL_SIZE * 2, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+http_session = new_http_session()
+
+# Shared by every scraper; Chrome only starts when a page actually needs it and closes when the program exits
+driver_pool = DriverPool()
+atexit.register(driver_pool.close)
+
+# Loads a page in Chrome, borrowing a pooled driver if the caller doesn't have one
+# scripts=True keeps scripts allowed whatever the site's profile, see DEFAULT_BLOCK_PROFILE
+def browser_fetch(site, url, driver=None, kind="detail", scripts=False):
+    if driver is None:
+        with driver_pool.acquire() as driver:
+            return browser_fetch(site, url, driver, kind, scripts)
+    browser_get(driver, site, url, kind, scripts)
+    return driver.page_source
+
+# Decodes with the charset from the Content-Type header, these sites are UTF-8 when it has none
+def decode_html(content, content_type):
+    match = re.search(r"charset=([\w-]+)", content_type or "", re.I)
+    try:
+        return content.decode(match.group(1) if match else "utf-8", errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+# Returns the page HTML over HTTP when the site allows it, otherwise (or if HTTP fails) from Chrome
+# Listing pages go through the HTTP cache
+def fetch_page(site, url, driver=None, kind="detail"):
+    return fetch_response(site, url, driver, kind)[0]
+
+# Same as fetch_page, also returning the response headers (empty for pages loaded in Chrome)
+def fetch_response(site, url, driver=None, kind="detail"):
+    if fetch_mode(site, kind) == "http":
+        try:
+            headers = {}
+            if kind == "listing":
+                status, content, content_type = cached_get(site, url)
+            else:
+                response = http_session.get(url, timeout=HTTP_TIMEOUT)
+                status, content, content_type = response.status_code, response.content, response.headers.get("Content-Type")
+                headers = dict(response.headers)
+            html = decode_html(content, content_type)
+            if status == 200 and html.strip():
+                return html, headers
+            print(f"HTTP {status} for {url}, retrying in browser")
+        except requests.RequestException as e:
+            print(f"HTTP error for {url} ({e}), retrying in browser")
+    # Pages that failed over HTTP keep their scripts in Chrome
+    return browser_fetch(site, url, driver, kind, scripts=fetch_mode(site, kind) == "http"), {}
+
+# ----- HTTP CACHE -----
+# Responses with an ETag or Last-Modified header are kept on disk and revalidated with conditional requests
+HTTP_CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR", "http_cache")
+
+# Cache hits (304 answered from disk) and misses per site
+cache_stats = {}
+cache_lock = threading.Lock()
+
+def cache_paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.body"), os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+def count_cache(site, hit):
+    with cache_lock:
+        stats = cache_stats.setdefault(site, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+# Writes to a temporary file first so a crash never leaves half a file behind
+def write_atomic(path, data):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# GET with If-None-Match / If-Modified-Since; a 304 is served from disk and reported as 200
+# Returns (status code, body bytes, content type)
+def cached_get(site, url, timeout=HTTP_TIMEOUT):
+    body_path, meta_path = cache_paths(url)
+
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(body_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = http_session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and meta:
+        count_cache(site, hit=True)
+        with open(body_path, "rb") as f:
+            return 200, f.read(), meta.get("content_type")
+
+    count_cache(site, hit=False)
+    content_type = response.headers.get("Content-Type")
+    if response.status_code == 200:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            write_atomic(body_path, response.content)
+            meta = {"url": url, "etag": etag, "last_modified": last_modified,
+                    "content_type": content_type, "fetched": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return response.status_code, response.content, content_type
+
+# Prints cache hits and misses per site
+def cache_report():
+    for site, stats in sorted(cache_stats.items()):
+        print(f"{site}: {stats['hits']} cache hits, {stats['misses']} misses")
+
+# ----- PDF DOWNLOADS -----
+# PDFs stream to a .part file in chunks so large decks are never held in memory
+# An interrupted download resumes with a Range request on the next run
+PDF_CHUNK_SIZE = 256 * 1024
+PDF_WORKERS = int(os.environ.get("SCRAPER_PDF_WORKERS", "4"))
+
+pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS)
+pdf_futures = []
+pdf_lock = threading.Lock()
+
+def read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def remove_partial(part_path, part_meta_path):
+    for path in (part_path, part_meta_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+# Downloads a PDF unless the copy on disk is still current, returns True when the file is available
+# restarted is set on the second try after a resume the server refused, which was already counted
+def download_pdf(site, pdf_url, pdf_path, timeout=15, restarted=False):
+    _, meta_path = cache_paths(pdf_url)
+    # Named after the link too, so two articles whose titles give the same file name never write one .part
+    part_path = f"{pdf_path}.{hashlib.sha256(pdf_url.encode('utf-8')).hexdigest()[:12]}.part"
+    part_meta_path = f"{part_path}.json"
+
+    headers = {}
+    meta = read_json(meta_path) if page_exists(pdf_path) else None
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    # If-Range makes the server send the whole file again when it changed since the partial download
+    part_meta = read_json(part_meta_path) if os.path.exists(part_path) else None
+    validator = part_meta and (part_meta.get("etag") or part_meta.get("last_modified"))
+    offset = os.path.getsize(part_path) if validator else 0
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+
+    restart = False
+    try:
+        with http_session.get(pdf_url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta:
+                # The saved copy is current, so a partial download of an older interrupted run isn't needed
+                remove_partial(part_path, part_meta_path)
+                if not restarted:
+                    count_cache(site, hit=True)
+                return True
+            if not restarted:
+                count_cache(site, hit=False)
+            if run_archive is not None:
+                response_headers[pdf_url] = dict(response.headers)
+
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and content_range.startswith(f"bytes {offset}-"):
+                mode = "ab"
+            elif response.status_code == 200:
+                mode = "wb"
+                part_meta = {"etag": response.headers.get("ETag"),
+                             "last_modified": response.headers.get("Last-Modified"),
+                             "content_type": response.headers.get("Content-Type")}
+                write_atomic(part_meta_path, json.dumps(part_meta).encode("utf-8"))
+            elif offset:
+                # A resume the server won't serve (416, or a 206 for other bytes) would fail the same way on every
+                # run, so the partial download is dropped and the PDF downloaded again from the start
+                print(f"Can't resume PDF ({response.status_code}), downloading it again: {pdf_url}")
+                restart = True
+            else:
+                print(f"Failed to download PDF ({response.status_code}): {pdf_url}")
+                return False
+
+            if not restart:
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=PDF_CHUNK_SIZE):
+                        f.write(chunk)
+    except (requests.RequestException, OSError) as e:
+        print(f"Error downloading {pdf_url}: {e}")
+        return False
+
+    if restart:
+        remove_partial(part_path, part_meta_path)
+        return download_pdf(site, pdf_url, pdf_path, timeout, restarted=True)
+
+    os.replace(part_path, pdf_path)
+    os.remove(part_meta_path)
+    if run_archive is not None:
+        with open(pdf_path, "rb") as f:
+            archive_record(site, pdf_url, pdf_path, f, os.path.getsize(pdf_path), response_headers.pop(pdf_url, None))
+    if PAGE_STORE:
+        store_file(site, pdf_url, pdf_path)
+    else:
+        index_file(site, pdf_url, pdf_path)
+    if part_meta.get("etag") or part_meta.get("last_modified"):
+        meta = dict(part_meta, url=pdf_url, fetched=now_iso())
+        write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return True
+
+# Starts a PDF download in the background so the article fetch can move on
+def queue_pdf(site, pdf_url, pdf_path, timeout=15):
+    future = pdf_executor.submit(download_pdf, site, pdf_url, pdf_path, timeout)
+    with pdf_lock:
+        pdf_futures.append(future)
+    return future
+
+# Blocks until every queued PDF is on disk (or failed), returns how many were downloaded
+def wait_for_pdfs():
+    with pdf_lock:
+        futures = list(pdf_futures)
+        pdf_futures.clear()
+    downloaded = 0
+    for future in futures:
+        try:
+            downloaded += bool(future.result())
+        except Exception as e:
+            print(f"Error downloading PDF: {e}")
+    return downloaded
+
+# ----- CRAWL STATE -----
+# Article links per site with when they were first seen and last fetched, kept between runs
+CRAWL_STATE_DB = os.environ.get("SCRAPER_STATE_DB", "crawl_state.db")
+# Set FULL_CRAWL=1 to walk every listing page and fetch every article again
+FULL_CRAWL = os.environ.get("FULL_CRAWL") == "1"
+
+state_conn = None
+state_lock = threading.Lock()
+# Links seen on each site's listing pages this run, recorded once its discovery finishes
+listing_links = {}
+
+def crawl_state():
+    global state_conn
+    if state_conn is None:
+        state_conn = sqlite3.connect(CRAWL_STATE_DB, check_same_thread=False)
+        state_conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "site TEXT NOT NULL, url TEXT NOT NULL, first_seen TEXT NOT NULL, last_fetched TEXT, "
+            "PRIMARY KEY (site, url))"
+        )
+        # Links on the listing pages of the last completed discovery per site, and when it completed
+        state_conn.execute(
+            "CREATE TABLE IF NOT EXISTS listing_links (site TEXT NOT NULL, url TEXT NOT NULL, PRIMARY KEY (site, url))"
+        )
+        state_conn.execute("CREATE TABLE IF NOT EXISTS crawls (site TEXT PRIMARY KEY, completed TEXT NOT NULL)")
+        state_conn.commit()
+    return state_conn
+
+def now_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+# Stores links not seen before and returns the ones that were already known
+def remember_links(site, urls):
+    with state_lock:
+        conn = crawl_state()
+        known = {row[0] for row in conn.execute("SELECT url FROM articles WHERE site = ?", (site,))}
+        conn.executemany(
+            "INSERT OR IGNORE INTO articles (site, url, first_seen) VALUES (?, ?, ?)",
+            [(site, url, now_iso()) for url in set(urls) - known],
+        )
+        conn.commit()
+    return known & set(urls)
+
+def fetched_links(site):
+    with state_lock:
+        rows = crawl_state().execute(
+            "SELECT url FROM articles WHERE site = ? AND last_fetched IS NOT NULL", (site,)
+        )
+        return {row[0] for row in rows}
+
+def mark_fetched(site, url):
+    with state_lock:
+        conn = crawl_state()
+        conn.execute(
+            "INSERT INTO articles (site, url, first_seen, last_fetched) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (site, url) DO UPDATE SET last_fetched = excluded.last_fetched",
+            (site, url, now_iso(), now_iso()),
+        )
+        conn.commit()
+
+# True when every link on a listing page was seen by an earlier discovery of the site that completed, and its
+# matching articles were fetched; paginated discoverers stop there, since older pages only hold older articles
+# Links are only known once a discovery finished, so a crawl that failed partway never hides the pages after
+# the one it stopped at
+def listing_page_known(site, page_urls, page_jobs):
+    with state_lock:
+        listing_links.setdefault(site, set()).update(page_urls)
+        conn = crawl_state()
+        completed = conn.execute("SELECT 1 FROM crawls WHERE site = ?", (site,)).fetchone()
+        known = {row[0] for row in conn.execute("SELECT url FROM listing_links WHERE site = ?", (site,))}
+    if FULL_CRAWL or not completed or not page_urls or set(page_urls) - known:
+        return False
+    fetched = fetched_links(site)
+    return all(job["url"] in fetched for job in page_jobs)
+
+# Records the listing links of a site's discovery once it finished, or forgets them when it failed
+def finish_listing(site, completed):
+    with state_lock:
+        urls = listing_links.pop(site, set())
+        if not completed:
+            return
+        conn = crawl_state()
+        conn.executemany("INSERT OR IGNORE INTO listing_links (site, url) VALUES (?, ?)", [(site, url) for url in urls])
+        conn.execute(
+            "INSERT INTO crawls (site, completed) VALUES (?, ?) "
+            "ON CONFLICT (site) DO UPDATE SET completed = excluded.completed",
+            (site, now_iso()),
+        )
+        conn.commit()
+
+# Drops articles fetched on an earlier run whose HTML is still saved
+def pending_jobs(jobs):
+    if FULL_CRAWL:
+        return jobs
+    fetched = {}
+    for site in {job["site"] for job in jobs}:
+        remember_links(site, [job["url"] for job in jobs if job["site"] == site])
+        fetched[site] = fetched_links(site)
+
+    pending = []
+    for job in jobs:
+        done = job["url"] in fetched[job["site"]] and (job["path"] is None or page_exists(job["path"]))
+        # Sites with a fetch_record write their metadata from this run's fetch results
+        if "fetch_record" in SITE_SPECS[job["site"]] or not done:
+            pending.append(job)
+    return pending
+
+# ----- PAGE STORE -----
+# Saved pages and PDFs are kept once per content (sha256), compressed, in PAGE_STORE_DIR
+# The index maps each page's path (like usc_articles/Keck_x.html) to its blob, site and URL, so the rest of
+# the scraper keeps using paths; files saved by older runs are still read from their folders
+# Set SCRAPER_PAGE_STORE=0 to save plain files instead; their links are still kept in the index (files table)
+PAGE_STORE = os.environ.get("SCRAPER_PAGE_STORE", "1") == "1"
+PAGE_STORE_DIR = os.environ.get("SCRAPER_PAGE_STORE_DIR", "page_store")
+PAGE_INDEX = os.path.join(PAGE_STORE_DIR, "index.db")
+
+# Blobs are zstd compressed when the zstandard package is installed, gzip otherwise
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+store_conn = None
+store_lock = threading.Lock()
+
+def page_index():
+    global store_conn
+    if store_conn is None:
+        os.makedirs(PAGE_STORE_DIR, exist_ok=True)
+        store_conn = sqlite3.connect(PAGE_INDEX, check_same_thread=False)
+        store_conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "path TEXT PRIMARY KEY, folder TEXT NOT NULL, site TEXT, url TEXT, blob TEXT NOT NULL, "
+            "size INTEGER NOT NULL, stored TEXT NOT NULL)"
+        )
+        store_conn.execute("CREATE INDEX IF NOT EXISTS pages_folder ON pages (folder)")
+        store_conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (site, url)")
+        store_conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, folder TEXT NOT NULL, site TEXT, url TEXT, stored TEXT NOT NULL)"
+        )
+        store_conn.execute("CREATE INDEX IF NOT EXISTS files_folder ON files (folder)")
+        store_conn.execute("CREATE INDEX IF NOT EXISTS files_url ON files (site, url)")
+        store_conn.commit()
+    return store_conn
+
+# The index is read whenever it exists, so pages stored earlier stay readable with SCRAPER_PAGE_STORE=0
+def index_rows(query, params):
+    if not (PAGE_STORE or store_conn is not None or os.path.exists(PAGE_INDEX)):
+        return []
+    with store_lock:
+        return page_index().execute(query, params).fetchall()
+
+# Compresses a stream into the blob named after its hash, unless that content is stored already
+def write_blob(source, digest):
+    for ext in (".zst", ".gz"):
+        blob = f"{digest[:2]}/{digest}{ext}"
+        if os.path.exists(os.path.join(PAGE_STORE_DIR, blob)):
+            return blob
+    blob = f"{digest[:2]}/{digest}{'.zst' if zstandard else '.gz'}"
+    blob_path = os.path.join(PAGE_STORE_DIR, blob)
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        if zstandard:
+            zstandard.ZstdCompressor(level=10).copy_stream(source, f)
+        else:
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0) as gz:
+                shutil.copyfileobj(source, gz, PDF_CHUNK_SIZE)
+    os.replace(tmp_path, blob_path)
+    return blob
+
+def index_page(site, url, path, blob, size):
+    with store_lock:
+        conn = page_index()
+        conn.execute(
+            "INSERT INTO pages (path, folder, site, url, blob, size, stored) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET site = excluded.site, url = excluded.url, blob = excluded.blob, "
+            "size = excluded.size, stored = excluded.stored",
+            (path, os.path.dirname(path), site, url, blob, size, now_iso()),
+        )
+        conn.commit()
+
+# Link of a page or PDF saved as a plain file, so its metadata is keyed by link like a stored page's
+def index_file(site, url, path):
+    with store_lock:
+        conn = page_index()
+        conn.execute(
+            "INSERT INTO files (path, folder, site, url, stored) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET site = excluded.site, url = excluded.url, stored = excluded.stored",
+            (path, os.path.dirname(path), site, url, now_iso()),
+        )
+        conn.commit()
+
+# Saves a fetched page (text or bytes) under its path
+def store_page(site, url, path, data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if run_archive is not None:
+        archive_record(site, url, path, io.BytesIO(data), len(data), response_headers.pop(url, None))
+    if not PAGE_STORE:
+        write_atomic(path, data)
+        index_file(site, url, path)
+        return path
+    blob = write_blob(io.BytesIO(data), hashlib.sha256(data).hexdigest())
+    index_page(site, url, path, blob, len(data))
+    return path
+
+# Moves a finished file (a downloaded PDF) into the store, reading it in chunks
+def store_file(site, url, path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(PDF_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        f.seek(0)
+        blob = write_blob(f, digest.hexdigest())
+    index_page(site, url, path, blob, os.path.getsize(path))
+    os.remove(path)
+    return path
+
+def stored_blob(path):
+    rows = index_rows("SELECT blob FROM pages WHERE path = ?", (path,))
+    return rows[0][0] if rows else None
+
+def page_exists(path):
+    return stored_blob(path) is not None or os.path.exists(path)
+
+def read_page_bytes(path):
+    if archive_reader is not None:
+        return archived_page(path)["body"]
+    blob = stored_blob(path)
+    if blob is None:
+        with open(path, "rb") as f:
+            return f.read()
+    with open(os.path.join(PAGE_STORE_DIR, blob), "rb") as f:
+        if blob.endswith(".gz"):
+            return gzip.decompress(f.read())
+        if zstandard is None:
+            raise RuntimeError(f"The zstandard package is needed to read {blob}")
+        return zstandard.ZstdDecompressor().stream_reader(f).read()
+
+# Reads a saved page as text, with newlines read the same way as open(path, "r")
+def read_page(path):
+    return io.TextIOWrapper(io.BytesIO(read_page_bytes(path)), encoding="utf-8").read()
+
+# Parses a page as fetched, with its newlines turned into \n the way read_page reads the saved copy, so the
+# fetch-time record is the same as the one extracted from the saved page later
+def parse_fetched(html):
+    return parse_html(re.sub(r"\r\n?", "\n", html))
+
+# Names of the files saved in a folder, stored or on disk, in name order
+def list_pages(folder):
+    if archive_reader is not None:
+        return sorted({os.path.basename(path) for path in archive_reader["pages"] if os.path.dirname(path) == folder})
+    names = set(os.listdir(folder)) if os.path.isdir(folder) else set()
+    names.update(os.path.basename(row[0]) for row in index_rows("SELECT path FROM pages WHERE folder = ?", (folder,)))
+    return sorted(names)
+
+# Link a saved page was fetched from, and the saved page of a link, from the archive being read or the
+# page store index (stored pages first, then plain files); None for files saved before the index kept links
+def saved_url(path):
+    if archive_reader is not None:
+        entry = archive_reader["pages"].get(path)
+        return entry["url"] if entry else None
+    rows = index_rows("SELECT url FROM pages WHERE path = ? AND url IS NOT NULL "
+                      "UNION ALL SELECT url FROM files WHERE path = ?", (path, path))
+    return rows[0][0] if rows else None
+
+def saved_path(site, url):
+    if archive_reader is not None:
+        return archive_reader["urls"].get((site, url))
+    rows = index_rows("SELECT path FROM pages WHERE site = ? AND url = ? "
+                      "UNION ALL SELECT path FROM files WHERE site = ? AND url = ?", (site, url, site, url))
+    return rows[0][0] if rows else None
+
+# Moves the pages and PDFs saved as files by older runs into the store
+# Run with: python -c "import proj7; proj7.pack_saved_files()"
+def pack_saved_files():
+    moved = 0
+    for site in SITE_SPECS:
+        for folder in (site_folder(site), f"{site}_pdfs"):
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                path = os.path.join(folder, name)
+                if name.endswith((".html", ".pdf")) and stored_blob(path) is None:
+                    store_file(site, saved_url(path), path)
+                    moved += 1
+    print(f"Moved {moved} saved files into {PAGE_STORE_DIR}")
+    return moved
+
+# Prints how many pages are stored, in how many distinct blobs, and their size before and after compression
+def store_report():
+    rows = index_rows("SELECT blob, size FROM pages", ())
+    if not rows:
+        return
+    blobs = {blob: size for blob, size in rows}
+    stored_bytes = sum(os.path.getsize(os.path.join(PAGE_STORE_DIR, blob)) for blob in blobs)
+    print(f"Page store: {len(rows)} pages in {len(blobs)} blobs, {sum(size for _, size in rows) / 1024:.0f} KB "
+          f"saved as {stored_bytes / 1024:.0f} KB")
+
+# ----- RUN ARCHIVE -----
+# With SCRAPER_RUN_ARCHIVE=1 every page and PDF saved during a run is also appended to one WARC file,
+# archives/run-<time>.warc.gz, as a response record with the URL, fetch time, headers and body
+# An archive holds only that run's fetches; baseline_archive writes one archive of every page saved so far
+# Each record is its own gzip member and its byte range is written to an index next to it (.idx, a JSON
+# line per record), so a page can be read from the middle of the file without reading what comes before
+RUN_ARCHIVE = os.environ.get("SCRAPER_RUN_ARCHIVE") == "1"
+ARCHIVE_DIR = os.environ.get("SCRAPER_ARCHIVE_DIR", "archives")
+# The body is saved as stored (pages as UTF-8), so these headers of the original response no longer apply
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+run_archive = None
+archive_reader = None
+archive_lock = threading.Lock()
+# Response headers of fetched pages and PDFs waiting to be archived with them, by URL
+response_headers = {}
+
+def start_run_archive(prefix="run"):
+    global run_archive
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(ARCHIVE_DIR, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}.warc.gz")
+    run_archive = {"path": path, "file": open(path, "ab"), "index": open(f"{path}.idx", "a", encoding="utf-8"),
+                   "records": 0}
+    print(f"Archiving this run to {path}")
+    return path
+
+def close_run_archive():
+    global run_archive
+    if run_archive is not None:
+        run_archive["file"].close()
+        run_archive["index"].close()
+        print(f"Archived {run_archive['records']} records to {run_archive['path']}")
+        run_archive = None
+
+# Appends one record, reading the body from a stream so PDFs are never held in memory
+# date is the fetch time as seconds since the epoch, now by default
+def archive_record(site, url, path, body, length, headers=None, date=None):
+    headers = {name: value for name, value in (headers or {}).items() if name.lower() not in DROPPED_HEADERS}
+    http_head = "HTTP/1.1 200 OK\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    http_head = f"{http_head}Content-Length: {length}\r\n\r\n".encode("latin-1", errors="replace")
+    date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(date))
+    warc_head = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {date}\r\n"
+        f"WARC-Target-URI: {url or ''}\r\n"
+        f"X-Scraper-Site: {site or ''}\r\n"
+        f"X-Scraper-Path: {path}\r\n"
+        "Content-Type: application/http; msgtype=response\r\n"
+        f"Content-Length: {len(http_head) + length}\r\n\r\n"
+    ).encode("utf-8")
+
+    with archive_lock:
+        f = run_archive["file"]
+        offset = f.tell()
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0) as gz:
+            gz.write(warc_head)
+            gz.write(http_head)
+            shutil.copyfileobj(body, gz, PDF_CHUNK_SIZE)
+            gz.write(b"\r\n\r\n")
+        f.flush()
+        entry = {"path": path, "site": site, "url": url, "date": date, "offset": offset, "length": f.tell() - offset}
+        run_archive["index"].write(json.dumps(entry) + "\n")
+        run_archive["index"].flush()
+        run_archive["records"] += 1
+
+# When a saved page or PDF was saved: its page store index row, or the file's modification time
+def saved_time(path):
+    rows = index_rows("SELECT stored FROM pages WHERE path = ? UNION ALL SELECT stored FROM files WHERE path = ?",
+                      (path, path))
+    if rows:
+        return time.mktime(time.strptime(rows[0][0], "%Y-%m-%dT%H:%M:%S"))
+    return os.path.getmtime(path)
+
+# Writes every page and PDF saved so far into one archive, archives/baseline-<time>.warc.gz, each dated
+# with when it was saved, so runs archived before SCRAPER_RUN_ARCHIVE was set can still be re-extracted
+# Run with: python -c "import proj7; proj7.baseline_archive()"
+def baseline_archive():
+    files = saved_pages()
+    for site in SITE_SPECS:
+        folder = f"{site}_pdfs"
+        files += [(site, os.path.join(folder, name)) for name in list_pages(folder) if name.endswith(".pdf")]
+    path = start_run_archive("baseline")
+    try:
+        for site, page_path in files:
+            data = read_page_bytes(page_path)
+            archive_record(site, saved_url(page_path), page_path, io.BytesIO(data), len(data),
+                           date=saved_time(page_path))
+    finally:
+        close_run_archive()
+    return path
+
+def header_fields(lines):
+    fields = {}
+    for line in lines:
+        name, _, value = line.partition(": ")
+        fields[name] = value
+    return fields
+
+# Splits a record into its WARC fields, response headers and body
+def parse_record(warc_head, block):
+    fields = header_fields(warc_head.split("\r\n")[1:])
+    http_head, _, body = block.partition(b"\r\n\r\n")
+    return {
+        "path": fields.get("X-Scraper-Path"),
+        "site": fields.get("X-Scraper-Site") or None,
+        "url": fields.get("WARC-Target-URI") or None,
+        "date": fields.get("WARC-Date"),
+        "headers": header_fields(http_head.decode("latin-1").split("\r\n")[1:]),
+        "body": body,
+    }
+
+# Every record of an archive in file order, read as one sequential stream (the index isn't needed)
+def archive_records(archive_path):
+    with gzip.open(archive_path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            head = [line.rstrip(b"\r\n").decode("utf-8")]
+            while True:
+                line = f.readline().rstrip(b"\r\n")
+                if not line:
+                    break
+                head.append(line.decode("utf-8"))
+            length = int(header_fields(head[1:])["Content-Length"])
+            block = f.read(length)
+            f.read(4)
+            yield parse_record("\r\n".join(head), block)
+
+# Reads the saved pages of an archived run instead of the page store: list_pages and read_page then only see
+# the pages of that run, read from the memory-mapped archive through its index
+def use_archive(archive_path):
+    global archive_reader
+    if archive_reader is not None:
+        archive_reader["map"].close()
+        archive_reader["file"].close()
+        archive_reader = None
+    if archive_path is None:
+        return
+    pages = {}
+    urls = {}
+    with open(f"{archive_path}.idx", "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            pages[entry["path"]] = entry
+            urls[(entry["site"], entry["url"])] = entry["path"]
+    f = open(archive_path, "rb")
+    archive_reader = {"path": archive_path, "pages": pages, "urls": urls, "file": f,
+                      "map": mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)}
+
+def archived_page(path):
+    entry = archive_reader["pages"].get(path)
+    if entry is None:
+        raise FileNotFoundError(f"{path} is not in {archive_reader['path']}")
+    data = gzip.decompress(archive_reader["map"][entry["offset"]:entry["offset"] + entry["length"]])
+    warc_head, _, rest = data.partition(b"\r\n\r\n")
+    warc_head = warc_head.decode("utf-8")
+    length = int(header_fields(warc_head.split("\r\n")[1:])["Content-Length"])
+    return parse_record(warc_head, rest[:length])
+
+# Extracts every site's pages in an archived run into archives/run-<time>.<site>.jsonl and the metadata store,
+# leaving the <site>_metadata.jsonl files of the latest run as they are
+# Articles go to a metadata store of their own next to the archive, so the live one keeps the latest versions
+# Run with: python -c "import proj7; proj7.archive_metadata('archives/run-....warc.gz')"
+def archive_metadata(archive_path):
+    use_archive(archive_path)
+    try:
+        extract_saved_articles()
+        print(f"Saved the JSON Lines files and metadata store of {archive_path}")
+    finally:
+        with metadata_lock:
+            conn = metadata_conns.pop(metadata_db(), None)
+            if conn is not None:
+                conn.close()
+        use_archive(None)
+
+# ----- METADATA STORE -----
+# Extracted articles of every site are upserted into one SQLite table, keyed by site and canonical URL
+# A row is only written when its article is new or changed, and date, site and title hash are indexed,
+# so "articles since a date" is answered without loading every JSON file
+# The per-site JSON Lines files are still written; set SCRAPER_METADATA_JSON=0 to skip them
+METADATA_DB = os.environ.get("SCRAPER_METADATA_DB", "metadata.db")
+METADATA_JSON = os.environ.get("SCRAPER_METADATA_JSON", "1") == "1"
+# Records written to the JSON Lines file and the store at a time
+METADATA_BATCH_SIZE = 100
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = re.compile(r"utm_\w+|fbclid|gclid|mc_cid|mc_eid|_ga|_hs\w+", re.IGNORECASE)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+metadata_conns = {}
+metadata_lock = threading.Lock()
+# New, changed and unchanged articles per site
+metadata_stats = {}
+
+# metadata.db, or archives/run-<time>.metadata.db while an archived run is read (see use_archive), so replaying
+# an older run never replaces the newer articles of the live store
+def metadata_db():
+    if archive_reader is not None:
+        return f"{archive_reader['path'].removesuffix('.warc.gz')}.metadata.db"
+    return METADATA_DB
+
+def metadata_store():
+    path = metadata_db()
+    metadata_conn = metadata_conns.get(path)
+    if metadata_conn is None:
+        metadata_conn = metadata_conns[path] = sqlite3.connect(path, check_same_thread=False)
+        metadata_conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "site TEXT NOT NULL, url TEXT NOT NULL, path TEXT NOT NULL, title TEXT, title_hash TEXT, "
+            "date TEXT, date_text TEXT, author TEXT, content TEXT, content_source TEXT, "
+            "record_hash TEXT NOT NULL, first_seen TEXT NOT NULL, updated TEXT NOT NULL, "
+            "PRIMARY KEY (site, url))"
+        )
+        metadata_conn.execute("CREATE INDEX IF NOT EXISTS metadata_date ON metadata (date)")
+        metadata_conn.execute("CREATE INDEX IF NOT EXISTS metadata_site ON metadata (site, date)")
+        metadata_conn.execute("CREATE INDEX IF NOT EXISTS metadata_title ON metadata (title_hash)")
+        metadata_conn.commit()
+    return metadata_conn
+
+# Lowercase scheme and host, no default port, fragment, tracking parameters or trailing slash
+def canonical_url(url):
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode([(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not TRACKING_PARAMS.fullmatch(name)])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+# Links of the pages saved in a folder, from the archive being read or the page store index
+def page_urls(folder):
+    if archive_reader is not None:
+        return {path: entry["url"] for path, entry in archive_reader["pages"].items()
+                if os.path.dirname(path) == folder}
+    urls = dict(index_rows("SELECT path, url FROM files WHERE folder = ?", (folder,)))
+    urls.update(index_rows("SELECT path, url FROM pages WHERE folder = ? AND url IS NOT NULL", (folder,)))
+    return urls
+
+def title_hash(title):
+    normalized = re.sub(r"\s+", " ", (title or "").strip().lower())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+# Some sites keep dates as written on the page; the date column is always YYYY-MM-DD
+# Parsed directly rather than through normalize_date, so dates already extracted aren't counted twice
+def record_date(text):
+    if not text:
+        return None
+    return parse_date_text(text)[0]
+
+# Pages saved before the index kept links are keyed by their file path (file:<path>) until a link is known
+def metadata_rows(site, folder, metadata, urls=None):
+    urls = page_urls(folder) if urls is None else urls
+    rows = {}
+    for record in metadata:
+        path = os.path.join(folder, record.get("file") or record.get("filename"))
+        url = urls.get(path)
+        url = canonical_url(url) if url else f"file:{path}"
+        values = (path, record.get("title"), title_hash(record.get("title")), record_date(record.get("date")),
+                  record.get("date"), record.get("author"), record.get("content"), record.get("content_source"))
+        record_hash = hashlib.sha256(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+        rows[url] = (site, url) + values + (record_hash,)
+    return rows
+
+# Writes only the rows whose article is new or changed since the last run
+def upsert_metadata(site, folder, metadata, urls=None):
+    rows = metadata_rows(site, folder, metadata, urls)
+    if not rows:
+        return
+    with metadata_lock:
+        conn = metadata_store()
+        # A page keyed by its path on an earlier run keeps its row under its link once the link is known,
+        # unless the link has a row already, then the path row is dropped
+        moved = [(url, site, f"file:{row[2]}") for url, row in rows.items() if not url.startswith("file:")]
+        conn.executemany("UPDATE OR IGNORE metadata SET url = ? WHERE site = ? AND url = ?", moved)
+        conn.executemany("DELETE FROM metadata WHERE site = ? AND url = ?", [row[1:] for row in moved])
+        known = dict(conn.execute(
+            f"SELECT url, record_hash FROM metadata WHERE site = ? AND url IN ({', '.join('?' * len(rows))})",
+            [site, *rows],
+        ))
+        changed = [row for url, row in rows.items() if known.get(url) != row[-1]]
+        conn.executemany(
+            "INSERT INTO metadata (site, url, path, title, title_hash, date, date_text, author, content, "
+            "content_source, record_hash, first_seen, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (site, url) DO UPDATE SET path = excluded.path, title = excluded.title, "
+            "title_hash = excluded.title_hash, date = excluded.date, date_text = excluded.date_text, "
+            "author = excluded.author, content = excluded.content, content_source = excluded.content_source, "
+            "record_hash = excluded.record_hash, updated = excluded.updated",
+            [row + (now_iso(), now_iso()) for row in changed],
+        )
+        conn.commit()
+        stats = metadata_stats.setdefault(site, {"new": 0, "changed": 0, "unchanged": 0})
+        new = sum(1 for row in changed if row[1] not in known)
+        stats["new"] += new
+        stats["changed"] += len(changed) - new
+        stats["unchanged"] += len(rows) - len(changed)
+
+# <site>_metadata.jsonl, or archives/run-<time>.<site>.jsonl while an archived run is read (see use_archive),
+# so extracting an older run never replaces the files of the latest one
+def metadata_filename(site):
+    if archive_reader is not None:
+        return f"{archive_reader['path'].removesuffix('.warc.gz')}.{site}.jsonl"
+    return f"{site}_metadata.jsonl"
+
+# Takes a site's extracted articles one at a time and writes them in batches, as one compact JSON record per
+# line, to <file>.part (readable while the site is still being extracted) and to the metadata store
+# close renames the file to its final name, so a finished file is never half written
+class MetadataWriter:
+    def __init__(self, site, folder, filename=None):
+        self.site = site
+        self.folder = folder
+        self.filename = filename = filename or metadata_filename(site)
+        self.part_path = f"{filename}.part"
+        self.file = open(self.part_path, "w", encoding="utf-8") if METADATA_JSON else None
+        self.urls = page_urls(folder)
+        self.batch = []
+        self.count = 0
+
+    def append(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= METADATA_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        upsert_metadata(self.site, self.folder, self.batch, self.urls)
+        if self.file:
+            self.file.write("".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                    for record in self.batch))
+            self.file.flush()
+        self.count += len(self.batch)
+        self.batch = []
+
+    # Returns how many records were written
+    def close(self):
+        self.flush()
+        if self.file:
+            self.file.close()
+            os.replace(self.part_path, self.filename)
+        return self.count
+
+# Reads a JSON Lines metadata file back one record at a time
+def read_metadata(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Articles dated on or after a YYYY-MM-DD date, oldest first, optionally of one site
+# Run with: python -c "import proj7; print(proj7.articles_since('2025-01-01'))"
+def articles_since(date, site=None):
+    query = "SELECT site, url, path, title, date, author, content, content_source FROM metadata WHERE date >= ?"
+    params = [date]
+    if site:
+        query += " AND site = ?"
+        params.append(site)
+    with metadata_lock:
+        cursor = metadata_store().execute(query + " ORDER BY date", params)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+def metadata_report():
+    if not metadata_stats:
+        return
+    print(f"Metadata store ({metadata_db()}):")
+    for site, stats in metadata_stats.items():
+        print(f"  {site}: {stats['new']} new, {stats['changed']} changed, {stats['unchanged']} unchanged")
+
+# ----- PARQUET EXPORT -----
+# Writes the articles of every site from the metadata store into one typed Parquet dataset, partitioned
+# as PARQUET_DIR/site=<site>/month=<YYYY-MM>/ (articles without a date go to month=unknown)
+# Each export only rewrites the partitions holding articles added or changed since the previous export,
+# including the partition an article was in before its date changed
+# Run with: python -c "import proj7; proj7.export_parquet()"
+PARQUET_DIR = os.environ.get("SCRAPER_PARQUET_DIR", "metadata_parquet")
+PARQUET_BATCH_SIZE = 1000
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+except ImportError:
+    pyarrow = None
+
+def parquet_schema():
+    return pyarrow.schema([
+        ("site", pyarrow.string()),
+        ("url", pyarrow.string()),
+        ("file", pyarrow.string()),
+        ("title", pyarrow.string()),
+        ("date", pyarrow.date32()),
+        ("author", pyarrow.string()),
+        ("content", pyarrow.string()),
+        ("content_source", pyarrow.string()),
+        ("month", pyarrow.string()),
+    ])
+
+# Rows of the changed partitions, read from the store in batches
+def parquet_batches(cursor, schema):
+    while True:
+        rows = cursor.fetchmany(PARQUET_BATCH_SIZE)
+        if not rows:
+            return
+        columns = [list(column) for column in zip(*rows)]
+        columns[2] = [os.path.basename(path) for path in columns[2]]
+        columns[4] = [datetime.date.fromisoformat(date) if date else None for date in columns[4]]
+        yield pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+
+# Month partition of articles without a date; a null month would go to the Hive default partition, which
+# pd.read_parquet can't combine with the other months
+UNKNOWN_MONTH = "unknown"
+
+def partition_dir(dataset_dir, site, month):
+    return os.path.join(dataset_dir, f"site={site}", f"month={month}")
+
+def export_parquet(dataset_dir=PARQUET_DIR):
+    if pyarrow is None:
+        raise RuntimeError("The pyarrow package is needed to export Parquet files")
+    start = time.perf_counter()
+    with metadata_lock:
+        conn = metadata_store()
+        # The month and version of every article as last exported to each dataset
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS exported (dataset TEXT NOT NULL, site TEXT NOT NULL, url TEXT NOT NULL, "
+            "month TEXT NOT NULL, record_hash TEXT NOT NULL, PRIMARY KEY (dataset, site, url))"
+        )
+        if not os.path.isdir(dataset_dir):
+            conn.execute("DELETE FROM exported WHERE dataset = ?", (dataset_dir,))
+
+        # Partitions to rewrite: the current month of every new or changed article, and the month it was
+        # exported in before, which still holds its old version when its date changed (or its row was moved
+        # from file:<path> to its link)
+        month = f"coalesce(substr(metadata.date, 1, 7), '{UNKNOWN_MONTH}')"
+        conn.execute("DROP TABLE IF EXISTS temp.export_partitions")
+        conn.execute(
+            f"CREATE TEMP TABLE export_partitions AS "
+            f"SELECT metadata.site AS site, {month} AS month FROM metadata LEFT JOIN exported "
+            f"ON exported.dataset = ? AND exported.site = metadata.site AND exported.url = metadata.url "
+            f"WHERE exported.record_hash IS NULL OR exported.record_hash != metadata.record_hash "
+            f"UNION SELECT exported.site, exported.month FROM exported LEFT JOIN metadata "
+            f"ON exported.site = metadata.site AND exported.url = metadata.url "
+            f"WHERE exported.dataset = ? AND (metadata.url IS NULL OR exported.record_hash != metadata.record_hash)",
+            (dataset_dir, dataset_dir),
+        )
+        partitions = conn.execute("SELECT site, month FROM export_partitions").fetchall()
+        for site, partition_month in partitions:
+            shutil.rmtree(partition_dir(dataset_dir, site, partition_month), ignore_errors=True)
+
+        in_partitions = f"(metadata.site, {month}) IN (SELECT site, month FROM export_partitions)"
+        cursor = conn.execute(
+            f"SELECT site, url, path, title, date, author, content, content_source, {month} "
+            f"FROM metadata WHERE {in_partitions} ORDER BY site, date, url"
+        )
+        schema = parquet_schema()
+        written = []
+        pyarrow.dataset.write_dataset(
+            parquet_batches(cursor, schema), dataset_dir, schema=schema, format="parquet",
+            partitioning=pyarrow.dataset.partitioning(
+                pyarrow.schema([("site", pyarrow.string()), ("month", pyarrow.string())]), flavor="hive"),
+            existing_data_behavior="overwrite_or_ignore",
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            file_visitor=lambda file: written.append(file.metadata.num_rows),
+        )
+        conn.execute(
+            f"INSERT INTO exported (dataset, site, url, month, record_hash) "
+            f"SELECT ?, site, url, {month}, record_hash FROM metadata WHERE {in_partitions} "
+            "ON CONFLICT (dataset, site, url) DO UPDATE SET month = excluded.month, "
+            "record_hash = excluded.record_hash",
+            (dataset_dir,),
+        )
+        conn.execute(
+            "DELETE FROM exported WHERE dataset = ? AND NOT EXISTS "
+            "(SELECT 1 FROM metadata WHERE metadata.site = exported.site AND metadata.url = exported.url)",
+            (dataset_dir,),
+        )
+        conn.execute("DROP TABLE temp.export_partitions")
+        conn.commit()
+    print(f"Exported {sum(written)} articles in {len(partitions)} partitions to {dataset_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return sum(written)
+
+# ----- EXTRACTED RECORDS -----
+# Metadata already extracted from the page parsed at fetch time, keyed by the saved HTML path
+# The metadata loops take (and drop) these instead of parsing the file again
+extracted_records = {}
+
 # ----- IGC PHARMA -----
-def scrape_igcpharma():
+def discover_igcpharma(driver):
     base_url = "https://igcpharma.com/category/news/"
     folder = "igcpharma_articles"
     os.makedirs(folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page("igcpharma", base_url, driver, "listing")
+    soup = parse_html(html)
 
+    jobs = []
     for article in soup.select("article"):
         heading = article.find(["h2", "h3"])
         link_tag = article.find("a", href=True)
@@ -46,101 +2256,60 @@ def scrape_igcpharma():
         if not title or not href or "alzheimer" not in title.lower():
             continue
 
-        driver.get(href)
-        time.sleep(2)
-
-        # Save HTML to folder
+        # HTML is saved to folder by the fetch stage
         safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
         html_path = os.path.join(folder, f"{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+        jobs.append({"site": "igcpharma", "url": href, "title": title, "path": html_path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- IGCPharma Metadata -----
-def extract_igcpharma_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1, h2, h3, .elementor-post-title, .entry-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date
-    date_tag = soup.select_one(".elementor-post-date, time, .post-date")
-    date = date_tag.get_text(strip=True) if date_tag else None
-
-    # Author
-    author = None
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    elif soup.select_one(".author, .byline, .post-author, .entry-author"):
-        author = soup.select_one(".author, .byline, .post-author, .entry-author").get_text(strip=True)
-    else:
-        # Fallback
-        text_lower = soup.get_text(" ", strip=True).lower()
-        if "rosalyn christian" in text_lower:
-            author = "Rosalyn Christian"
-        elif "john nesbett" in text_lower:
-            author = "John Nesbett"
-        else:
-            author = "IGC Pharma"
-
-    # Content 
-    article_container = soup.select_one("article, .elementor-post, .entry-content, main, .post")
-    content_container = article_container or soup
-    paragraphs = content_container.find_all("p")
-    content = "\n".join(p.get_text(" ", strip=True) for p in paragraphs if p.get_text(strip=True))
-
-    # Clean unwanted sections
-    content = re.sub(
-        r"(Contact Information.*|Forward[- ]Looking Statements.*|Recent Post.*|Related Posts.*)",
-        "",
-        content,
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    content = re.sub(
-        r"(Rosalyn Christian.*|John Nesbett.*|Investor Relations.*|VP of Clinical.*)",
-        "",
-        content,
-        flags=re.IGNORECASE
-    )
-    content = re.sub(r"\n{2,}", "\n\n", content).strip()
-
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "html",
-    }
-
-# Parse saved HTML
-def igcpharma_metadata(folder="igcpharma_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_igcpharma_content(path)
-        metadata.append(data)
-    save_json(metadata, "igcpharma_metadata.json")
-    return metadata
+# Named in the page text when there is no author element
+def igcpharma_author(soup):
+    text_lower = soup.get_text(" ", strip=True).lower()
+    if "rosalyn christian" in text_lower:
+        return "Rosalyn Christian"
+    if "john nesbett" in text_lower:
+        return "John Nesbett"
+    return "IGC Pharma"
+
+SITE_SPECS["igcpharma"] = {
+    "name": "IGC Pharma",
+    "discover": discover_igcpharma,
+    "discover_rank": 11,
+    "file_key": "filename",
+    "title": ["h1, h2, h3, .elementor-post-title, .entry-title"],
+    "date": [{"selector": ".elementor-post-date, time, .post-date"}],
+    "normalize_date": False,
+    "author_meta": True,
+    "author_selector": AUTHOR_SELECTOR,
+    "author": igcpharma_author,
+    "containers": "article, .elementor-post, .entry-content, main, .post",
+    "page_fallback": True,
+    "content_filter": [
+        ("cut", r"Contact Information", re.IGNORECASE),
+        ("cut", r"Forward[- ]Looking Statements", re.IGNORECASE),
+        ("cut", r"Recent Post", re.IGNORECASE),
+        ("cut", r"Related Posts", re.IGNORECASE),
+        ("line", r"Rosalyn Christian", re.IGNORECASE),
+        ("line", r"John Nesbett", re.IGNORECASE),
+        ("line", r"Investor Relations", re.IGNORECASE),
+        ("line", r"VP of Clinical", re.IGNORECASE),
+    ],
+    "cleanup": [(r"\n{2,}", "\n\n"), str.strip],
+}
 
 # ----- ASCENEURON -----
-def scrape_asceneuron():
+def discover_asceneuron(driver):
     base_url = "https://asceneuron.com/news-events/"
     folder = "asceneuron_articles"
     os.makedirs(folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
+    browser_get(driver, "asceneuron", base_url, "listing")
 
     seen_links = set()
     while True:
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = parse_html(driver.page_source)
         articles = soup.select("div.df-item-wrap.df-cpt-title-wrap a")
         current_links = {urljoin(base_url, a.get("href")) for a in articles}
         new_links = current_links - seen_links
@@ -150,144 +2319,81 @@ def scrape_asceneuron():
 
         try:
             load_more = driver.find_element(By.CSS_SELECTOR, ".df-cptfilter-load-more")
+            loaded = page_progress(driver, "asceneuron")
             driver.execute_script("arguments[0].click();", load_more)
-            time.sleep(3)
+            if not wait_for_page(driver, "asceneuron", "more", baseline=loaded):
+                break
         except:
             break
+    record_resources(driver, "asceneuron")
 
-    # Folder for PDFs
-    pdf_folder = "asceneuron_pdfs"
-    os.makedirs(pdf_folder, exist_ok=True)
-
-    for href in seen_links:
-        driver.get(href)
-        time.sleep(2)
-        detail_soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        title_tag = detail_soup.select_one("h1, .entry-title")
-        title = title_tag.get_text(strip=True) if title_tag else "Untitled"
-        if "alzheimer" not in title.lower():
-            continue
-
-        safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
-        html_path = os.path.join(folder, f"AsceNeuron_{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        print("Saved HTML:", title)
+    # Titles are only known once the article is opened, see save_asceneuron_page
+    return [{"site": "asceneuron", "url": href, "title": None, "path": None} for href in seen_links]
 
-        # Downloads PDF if available
-        pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
-        if not pdf_link_tag:
-            pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf", re.I))
-
-        if pdf_link_tag and pdf_link_tag.get("href"):
-            pdf_url = urljoin(base_url, pdf_link_tag["href"])
-            pdf_filename = f"AsceNeuron_{safe_title}.pdf"
-            pdf_path = os.path.join(pdf_folder, pdf_filename)
+def save_asceneuron_page(job, html):
+    folder = "asceneuron_articles"
+    detail_soup = parse_fetched(html)
 
-            try:
-                response = requests.get(pdf_url, timeout=10)
-                if response.status_code == 200:
-                    with open(pdf_path, "wb") as pdf_file:
-                        pdf_file.write(response.content)
-                else:
-                    print(f"Failed to download PDF ({response.status_code}): {pdf_url}")
-            except Exception as e:
-                print(f"Error downloading {pdf_url}: {e}")
+    title_tag = detail_soup.select_one("h1, .entry-title")
+    title = title_tag.get_text(strip=True) if title_tag else "Untitled"
+    if "alzheimer" not in title.lower():
+        return None
 
-# ----- AsceNeuron Metadata -----
-def extract_asceneuron_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.df-cpt-title, h1, .entry-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date 
-    date_text = None
-
-    # Common date tags
-    date_tag = soup.select_one("time, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
+    safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
+    html_path = os.path.join(folder, f"AsceNeuron_{safe_title}.html")
+    store_page("asceneuron", job["url"], html_path, html)
+    print("Saved HTML:", title)
 
-    # Try parsing the date
-    date = None
-    # Date cleaning
-    if date_text:
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", date_text)
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
+    # Folder for PDFs
+    pdf_folder = "asceneuron_pdfs"
+    os.makedirs(pdf_folder, exist_ok=True)
 
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
+    # Downloads PDF if available
+    pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
+    if not pdf_link_tag:
+        pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf", re.I))
 
-    # Author
-    author = "AsceNeuron"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    elif soup.select_one(".author, .byline, .post-author, .entry-author"):
-        author = soup.select_one(".author, .byline, .post-author, .entry-author").get_text(strip=True)
+    if pdf_link_tag and pdf_link_tag.get("href"):
+        pdf_url = urljoin(job["url"], pdf_link_tag["href"])
+        pdf_filename = f"AsceNeuron_{safe_title}.pdf"
+        pdf_path = os.path.join(pdf_folder, pdf_filename)
 
-    # Content
-    container = soup.select_one(".df-cpt-content, .elementor-widget-theme-post-content, .entry-content, article, .content, main")
-    paragraphs = []
-    if container:
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text and text not in paragraphs:
-                paragraphs.append(text)
-    content = "\n".join(paragraphs)
-    summary = content[:750] if content else None
+        queue_pdf("asceneuron", pdf_url, pdf_path, timeout=10)
 
-    return {
-        "filename": os.path.basename(path),       
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
+    extracted_records[html_path] = extract_site("asceneuron", html_path, detail_soup)
+    return html_path
 
-# Parse saved HTML
-def asceneuron_metadata(folder="asceneuron_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_igcpharma_content(path)
-        metadata.append(data)
-    save_json(metadata, "asceneuron_metadata.json")
-    return metadata
+# ----- AsceNeuron Metadata -----
+SITE_SPECS["asceneuron"] = {
+    "name": "AsceNeuron",
+    "discover": discover_asceneuron,
+    "discover_rank": 4,
+    "save_page": save_asceneuron_page,
+    "file_key": "filename",
+    "title": ["h1.df-cpt-title, h1, .entry-title"],
+    "date": [{"selector": DATE_SELECTOR, "attr": "datetime"}],
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_clean": [(DATELINE_PREFIX, "")],
+    "author_meta": True,
+    "author_selector": AUTHOR_SELECTOR,
+    "author": "AsceNeuron",
+    "containers": ".df-cpt-content, .elementor-widget-theme-post-content, .entry-content, article, .content, main",
+    "dedupe": True,
+    "truncate": 750,
+}
 
 # ----- Aprinoia -----
-def scrape_aprinoia():
+def discover_aprinoia(driver):
     folder = "aprinoia_articles"
     os.makedirs(folder, exist_ok=True)
 
     base_url = "https://aprinoia.com/news/"
-    driver.get(base_url)
-    time.sleep(2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page("aprinoia", base_url, driver, "listing")
+    soup = parse_html(html)
 
     article_links = soup.select("h2 a, h3 a, .elementor-post__title a")
 
+    jobs = []
     for a in article_links:
         title = a.get_text(strip=True)
         href = a.get("href")
@@ -295,138 +2401,47 @@ def scrape_aprinoia():
             continue
         full_link = urljoin(base_url, href)
 
-        driver.get(full_link)
-        time.sleep(2)
-
-        # Save HTML to folder
+        # HTML is saved to folder by the fetch stage
         safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title)
         html_path = os.path.join(folder, f"Aprinoia_{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+        jobs.append({"site": "aprinoia", "url": full_link, "title": title, "path": html_path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- Aprinoia Metadata -----
-def extract_aprinoia_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.entry-title, h1.post-title, h1")
-    if not title_tag:
-        title_tag = soup.find("title")
-    if title_tag:
-        title = title_tag.get_text(strip=True)
-    else:
-        title = os.path.basename(path).replace(".html", "").replace("_", " ")
-
-    # Date
-    date_text = None
-    date_tag = soup.select_one("time.entry-date, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        for tag in soup.find_all(["em", "strong", "p"]):
-            text = tag.get_text(" ", strip=True)
-            if re.search(
-                r"(January|February|March|April|May|June|July|August|September|October|November|December).*\d{4}",
-                text,
-            ):
-                date_text = text
-                break
-
-    # If still not found, search entire text for any date-like string
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    # Clean and parse date text
-    date = None
-    if date_text:
-        cleaned = (
-            date_text.replace("\u2013", "-")  
-                     .replace("–", "-")
-                     .replace("—", "-")
-                     .strip()
-        )
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", cleaned)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}",
-            cleaned,
-        )
-        if match:
-            cleaned = match.group(0)
-
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
-
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = "Aprinoia"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    elif soup.select_one(".author, .byline, .post-author, .entry-author"):
-        author = soup.select_one(".author, .byline, .post-author, .entry-author").get_text(strip=True)
-
-    # Content
-    content_containers = soup.select(".entry-content, article, .content, main")
-    paragraphs = []
-    for container in content_containers:
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    if not paragraphs:
-        for p in soup.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    content = "\n".join(paragraphs)
-    summary = content[:750] if content else None
-
-    return {
-        "file": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
-
-# Parse saved HTML
-def aprinoia_metadata(folder="aprinoia_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_aprinoia_content(path)
-        metadata.append(data)
-    save_json(metadata, "aprinoia_metadata.json")
-    return metadata
+# Keeps just the "Month D, YYYY" part when the date text has more around it
+def first_month_day_year(text):
+    match = MONTH_DAY_YEAR.search(text)
+    return match.group(0) if match else text
+
+SITE_SPECS["aprinoia"] = {
+    "name": "Aprinoia",
+    "discover": discover_aprinoia,
+    "discover_rank": 12,
+    "file_key": "file",
+    "title": ["h1.entry-title, h1.post-title, h1", "title"],
+    "title_default": "name_spaces",
+    "date": [{"selector": "time.entry-date, .post-date, .entry-date, .elementor-post-date", "attr": "datetime"}],
+    "date_blocks": (["em", "strong", "p"], MONTH_AND_YEAR),
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_scan_text": True,
+    "date_clean": [replace_dashes, (DATELINE_PREFIX, ""), first_month_day_year],
+    "author_meta": True,
+    "author_selector": AUTHOR_SELECTOR,
+    "author": "Aprinoia",
+    "containers": ".entry-content, article, .content, main",
+    "container_mode": "all",
+    "page_fallback": True,
+    "truncate": 750,
+}
 
 # ----- UC Davis -----
-def scrape_ucdavis():
+def discover_ucdavis(driver):
     folder = "ucdavis_articles"
     os.makedirs(folder, exist_ok=True)
 
     base_url = "https://health.ucdavis.edu/alzheimers-research/news/topic/neurological-health"
-    driver.get(base_url) 
-    time.sleep(2)
+    browser_get(driver, "ucdavis", base_url, "listing")
 
     seen_links = set()
 
@@ -434,15 +2449,17 @@ def scrape_ucdavis():
     last_height = driver.execute_script("return document.body.scrollHeight")
     while True:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        wait_for_page(driver, "ucdavis", "more", baseline=last_height)
         new_height = driver.execute_script("return document.body.scrollHeight")
         if new_height == last_height:
             break
         last_height = new_height
+    record_resources(driver, "ucdavis")
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = parse_html(driver.page_source)
     article_links = soup.select("h2 a, h3 a, h4 a")
 
+    jobs = []
     for a in article_links:
         title = a.get_text(strip=True)
         href = a.get("href")
@@ -454,110 +2471,47 @@ def scrape_ucdavis():
             continue
         seen_links.add(full_link)
 
-        driver.get(full_link)
-
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, ".article-body, .news-body, div.text-body, div.parsys")
-                )
-            )
-        except:
-            print("Timeout waiting for article body on:", full_link)
-
-        time.sleep(1.5)
-        page_html = driver.page_source
-
-        # Save article HTML
+        # Article HTML is saved by the fetch stage
         safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
         html_path = os.path.join(folder, f"UCDavis_{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(page_html)
+        jobs.append({"site": "ucdavis", "url": full_link, "title": title, "path": html_path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- UC Davis Metadata -----
-def extract_ucdavis_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    jsonld_tag = soup.find("script", type="application/ld+json")
-    if jsonld_tag:
-        try:
-            data = json.loads(jsonld_tag.string)
-            if isinstance(data, dict):
-                headline = data.get("headline")
-                date = data.get("datePublished")
-                author = None
-                author_data = data.get("author")
-                if isinstance(author_data, dict):
-                    author = author_data.get("name")
-                elif isinstance(author_data, list) and len(author_data) > 0:
-                    author = author_data[0].get("name")
-                description = data.get("description")
-                return {
-                    "filename": os.path.basename(path),
-                    "title": headline,
-                    "date": date,
-                    "author": author,
-                    "content": description,
-                    "content_source": "jsonld",
-                }
-        except Exception:
-            pass
-
-    # Fallback
-    title_tag = soup.select_one("h1, .article-title, .news-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    date_tag = soup.select_one("time, .news-date, .article-date")
-    date = date_tag.get_text(strip=True) if date_tag else None
-
-    author_tag = soup.select_one(".author, .byline, .article-author")
-    author = author_tag.get_text(strip=True) if author_tag else "UC Davis Health"
-
-    content_container = soup.select_one(".article-body, .news-body, main, div.text-body, div.parsys") or soup
-    paragraphs = content_container.find_all(["p", "li"])
-    content = "\n".join(p.get_text(" ", strip=True) for p in paragraphs if p.get_text(strip=True))
-
-    summary = content[:750] if content else None
-
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html",
-    }
-
-# Parse saved HTML
-def ucdavis_metadata(folder="ucdavis_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_ucdavis_content(path)
-        metadata.append(data)
-    save_json(metadata, "ucdavis_metadata.json")
-    return metadata
+SITE_SPECS["ucdavis"] = {
+    "name": "UC Davis",
+    "discover": discover_ucdavis,
+    "discover_rank": 3,
+    "file_key": "filename",
+    "jsonld": True,
+    "title": ["h1, .article-title, .news-title"],
+    "date": [{"selector": "time, .news-date, .article-date"}],
+    "normalize_date": False,
+    "author_selector": ".author, .byline, .article-author",
+    "author": "UC Davis Health",
+    "containers": ".article-body, .news-body, main, div.text-body, div.parsys",
+    "page_fallback": True,
+    "paragraph_tags": ["p", "li"],
+    "truncate": 750,
+}
 
 # ----- AGeneBio -----
-def scrape_agenebio():
+def discover_agenebio(driver):
     base_url = "https://agenebio.com/about-us/recent-news/"
     folder = "agenebio_articles"
     os.makedirs(folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
-
+    url = base_url
     seen_links = set()
+    jobs = []
 
-    while True:
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+    while url:
+        html = fetch_page("agenebio", url, driver, "listing")
+        soup = parse_html(html)
         article_links = soup.select("h2 a, h3 a") 
 
+        page_start = len(jobs)
         for a in article_links:
             title = a.get_text(strip=True)
             href = a.get("href")
@@ -569,140 +2523,59 @@ def scrape_agenebio():
                 continue
             seen_links.add(full_link)
 
-            driver.get(full_link)
-            time.sleep(2)
-
-            # Saves HTML
+            # HTML is saved by the fetch stage
             safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
             html_path = os.path.join(folder, f"{safe_title}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-
-            print("Saved HTML:", title)
+            jobs.append({"site": "agenebio", "url": full_link, "title": title, "path": html_path})
 
-            driver.back()
-            time.sleep(2)
-
-        # Clicks next page button until no more pages 
-        try:
-            next_button = driver.find_element(By.CSS_SELECTOR, "a.next.page-numbers")
-            driver.execute_script("arguments[0].click();", next_button)
-            time.sleep(2)
-        except:
+        # Stops once a whole listing page was already crawled on an earlier run
+        page_urls = [urljoin(base_url, a.get("href")) for a in article_links if a.get("href")]
+        if listing_page_known("agenebio", page_urls, jobs[page_start:]):
+            print("AGeneBio: reached articles from earlier runs, stopping.")
             break
 
-# ----- AGeneBio Metadata -----
-def extract_agenebio_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.entry-title, h1.post-title, h1")
-    if not title_tag:
-        title_tag = soup.find("title")
-    if title_tag:
-        title = title_tag.get_text(strip=True)
-    else:
-        title = os.path.basename(path).replace(".html", "").replace("_", " ")
-
-    # Date 
-    date_text = None
-
-    # Common date tags
-    date_tag = soup.select_one("time, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    # Try parsing the date
-    date = None
-    # Date cleaning
-    if date_text:
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", date_text)
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
-
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = None
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    elif soup.select_one(".author, .byline, .post-author, .entry-author"):
-        author = soup.select_one(".author, .byline, .post-author, .entry-author").get_text(strip=True)
-    else:
-        author = "AGeneBio"
-
-    # Content
-    content_containers = soup.select(".entry-content, .elementor-widget-container, article, .post-content")
-    paragraphs = []
-    for container in content_containers:
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    if not paragraphs:
-        for p in soup.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    # Clean irrelevant text
-    cleaned_paragraphs = []
-    for p in paragraphs:
-        lower_p = p.lower()
-        if any(x in lower_p for x in [
-            "©", "all rights reserved", "register now", "stay up to date",
-            "read more", "contact", "suite", "baltimore, md", "@agenebio",
-            "p:", "phone", "inc."
-        ]):
-            continue
-        if re.search(r"\d{3}[-.\s]\d{3}[-.\s]\d{4}", p):
-            continue
-        cleaned_paragraphs.append(p)
-
-    content = "\n".join(cleaned_paragraphs)
-    content = re.sub(r"^«\s*back.*?\n", "", content, flags=re.IGNORECASE)
-    summary = content[:750] if content else None
+        # Follows the next page link until no more pages
+        next_tag = soup.select_one("a.next.page-numbers")
+        if next_tag and next_tag.get("href"):
+            url = urljoin(base_url, next_tag["href"])
+        else:
+            break
 
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
+    return jobs
 
-# Parse saved HTML
-def agenebio_metadata(folder="agenebio_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_agenebio_content(path)
-        metadata.append(data)
-    save_json(metadata, "agenebio_metadata.json")
-    return metadata
+# ----- AGeneBio Metadata -----
+AGENEBIO_BOILERPLATE = [
+    "©", "all rights reserved", "register now", "stay up to date",
+    "read more", "contact", "suite", "baltimore, md", "@agenebio",
+    "p:", "phone", "inc."
+]
+PHONE_NUMBER = r"\d{3}[-.\s]\d{3}[-.\s]\d{4}"
+
+SITE_SPECS["agenebio"] = {
+    "name": "AGeneBio",
+    "discover": discover_agenebio,
+    "discover_rank": 5,
+    "file_key": "filename",
+    "title": ["h1.entry-title, h1.post-title, h1", "title"],
+    "title_default": "name_spaces",
+    "date": [{"selector": DATE_SELECTOR, "attr": "datetime"}],
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_clean": [(DATELINE_PREFIX, "")],
+    "author_meta": True,
+    "author_selector": AUTHOR_SELECTOR,
+    "author": "AGeneBio",
+    "containers": ".entry-content, .elementor-widget-container, article, .post-content",
+    "container_mode": "all",
+    "page_fallback": True,
+    # Footer, contact and sign-up paragraphs
+    "paragraph_filter": [("reject", re.escape(text), re.IGNORECASE) for text in AGENEBIO_BOILERPLATE]
+                        + [("reject", PHONE_NUMBER)],
+    "content_filter": [("drop", r"^«\s*back.*?\n", re.IGNORECASE)],
+    "truncate": 750,
+}
 
 # ----- USC -----
-def scrape_usc():
+def discover_usc(driver):
     folder = "usc_articles"
     os.makedirs(folder, exist_ok=True)
 
@@ -710,18 +2583,19 @@ def scrape_usc():
     url = base_url
     page_num = 1
     seen_links = set()
+    jobs = []
 
     while url:
-        driver.get(url)
-        time.sleep(10)
+        html = fetch_page("usc", url, driver, "listing")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = parse_html(html)
         article_links = soup.select("h2 a, h3 a, a[href*='/news/']")
 
         if not article_links:
             print("No articles found on this page.")
             break
 
+        page_start = len(jobs)
         for a in article_links:
             title = a.get_text(strip=True)
             href = a.get("href")
@@ -733,116 +2607,62 @@ def scrape_usc():
                 continue
             seen_links.add(full_link)
 
-            driver.get(full_link)
-            time.sleep(2)
-
-            # Saves HTML
+            # HTML is saved by the fetch stage
             safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title)
             html_path = os.path.join(folder, f"Keck_{safe_title}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
+            jobs.append({"site": "usc", "url": full_link, "title": title, "path": html_path})
 
-            print("Saved HTML:", title)
+        # Stops once a whole listing page was already crawled on an earlier run
+        page_urls = [urljoin(base_url, a.get("href")) for a in article_links if a.get("href")]
+        if listing_page_known("usc", page_urls, jobs[page_start:]):
+            print("USC: reached articles from earlier runs, stopping.")
+            break
 
         # Check for next page
         next_page_tag = soup.select_one(f"a[href*='/page/{page_num+1}/']")
         if next_page_tag and next_page_tag.get("href"):
             url = urljoin(base_url, next_page_tag.get("href"))
             page_num += 1
-            time.sleep(1)
         else:
             break
 
-# ----- USC Metadata -----
-def extract_usc_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-    # Title
-    title_tag = soup.select_one("h1.entry-title, h1.post-title, h1") or soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else None
+    return jobs
 
-    # Fallback
+# ----- USC Metadata -----
+# Titles that are missing or just a URL are rebuilt from the file name
+def clean_usc_title(title, path):
     if not title or title.startswith("http") or re.match(r'www\.', title.lower()):
-        # Cleaning title
         filename = os.path.basename(path).replace(".html", "")
-        filename = re.sub(r'^Keck_', '', filename)
-        filename = re.sub(r'_+', ' ', filename)
-        title = filename.strip()
-
-    # Date
-    date = None
-
-    date_tag = soup.select_one("time.entry-date, .post-date, .entry-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-        if date_text:
-            try:
-                parsed_date = dateparser.parse(date_text.strip(), fuzzy=True)
-                if parsed_date:
-                    date = parsed_date.strftime("%Y-%m-%d")
-            except:
-                date = None
-
-    # Fallback
-    if not date:
-        span_tag = soup.select_one("span.date")
-        if span_tag:
-            date_text = span_tag.get_text(strip=True)
-            if date_text:
-                try:
-                    parsed_date = dateparser.parse(date_text, fuzzy=True)
-                    if parsed_date:
-                        date = parsed_date.strftime("%Y-%m-%d")
-                except:
-                    date = None
-
-    # Author
-    author = "Keck USC"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author.get("content")
-    elif soup.select_one(".author, .byline, .post-author, .entry-author"):
-        author = soup.select_one(".author, .byline, .post-author, .entry-author").get_text(strip=True)
-
-    # Content
-    content_containers = soup.select("article, .entry-content, main, .content")
-    paragraphs = []
-    for container in content_containers:
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-    content = "\n".join(paragraphs)
-    summary = content[:750] if content else None
-
-    return {
-        "file": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
-
-# Parse saved HTML
-def usc_metadata(folder="usc_articles"):
-    metadata = []
-    seen_titles = set()
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_usc_content(path)
-        normalized_title = re.sub(r'\s+', ' ', data["title"].strip().lower())
-        if normalized_title in seen_titles:
-            continue
-        seen_titles.add(normalized_title)
-        metadata.append(data)
-    save_json(metadata, "usc_metadata.json")
-    return metadata
+        filename = re.sub(r'^Keck_', '', filename)
+        filename = re.sub(r'_+', ' ', filename)
+        title = filename.strip()
+    return title
+
+SITE_SPECS["usc"] = {
+    "name": "USC",
+    "discover": discover_usc,
+    "discover_rank": 2,
+    "unique_titles": True,
+    "file_key": "file",
+    "title": ["h1.entry-title, h1.post-title, h1", "title"],
+    "title_default": None,
+    "title_hook": clean_usc_title,
+    "date": [
+        {"selector": "time.entry-date, .post-date, .entry-date", "attr": "datetime"},
+        {"selector": "span.date"},
+    ],
+    "date_retry": True,
+    "date_clean": [str.strip],
+    "author_meta": True,
+    "author_selector": AUTHOR_SELECTOR,
+    "author": "Keck USC",
+    "containers": "article, .entry-content, main, .content",
+    "container_mode": "all",
+    "truncate": 750,
+}
 
 # ----- Teikoku -----
-def scrape_teikoku():
+def discover_teikoku(driver):
     folder = "teikoku_articles"
     os.makedirs(folder, exist_ok=True)
 
@@ -850,18 +2670,19 @@ def scrape_teikoku():
     url = base_url
     page_num = 1
     seen_links = set()
+    jobs = []
 
     while url:
-        driver.get(url)
-        time.sleep(3) 
+        html = fetch_page("teikoku", url, driver, "listing")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = parse_html(html)
         article_links = soup.select("a[href*='/company/news-press/'][title]")
 
         if not article_links:
             print("No articles found on this page.")
             break
 
+        page_start = len(jobs)
         for a in article_links:
             title = a.get_text(strip=True)
             href = a.get("href")
@@ -873,124 +2694,62 @@ def scrape_teikoku():
                 continue
             seen_links.add(full_link)
 
-            driver.get(full_link)
-            time.sleep(2)
-
-            # Saves HTML to folder
+            # HTML is saved to folder by the fetch stage
             safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
             html_path = os.path.join(folder, f"Teikoku_{safe_title}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
+            jobs.append({"site": "teikoku", "url": full_link, "title": title, "path": html_path})
 
-            print("Saved HTML:", title)
+        # Stops once a whole listing page was already crawled on an earlier run
+        page_urls = [urljoin(base_url, a.get("href")) for a in article_links if a.get("href")]
+        if listing_page_known("teikoku", page_urls, jobs[page_start:]):
+            print("Teikoku: reached articles from earlier runs, stopping.")
+            break
 
-        # Clicks next page button until no more pages 
+        # Follows the next page link until no more pages
         next_page_selector = f"a.page.larger[title='Page {page_num+1}']"
         next_tag = soup.select_one(next_page_selector)
         if next_tag and next_tag.get("href"):
             url = next_tag["href"]
             page_num += 1
-            time.sleep(1)
         else:
             break
 
-# ----- Teikoku Metadata -----
-def extract_teikoku_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.entry-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date 
-    date_text = None
-
-    # Common date tags
-    date_tag = soup.select_one("time, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    date = None
-    # Date cleaning
-    if date_text:
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", date_text)
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
-
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = "Teikoku Pharma USA"
-
-    # Content
-    paragraphs = []
-    for container in soup.select("div.wp-block-post-content, div.post-content, span.wp-block-paragraph"):
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    content = "\n".join(paragraphs)
-    summary = content[:750] if content else None
-
-    return {
-        "file": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
+    return jobs
 
-# Parse saved HTML
-def teikoku_metadata(folder="teikoku_articles"):
-    metadata = []
-    seen_titles = set()
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_teikoku_content(path)
-        normalized = re.sub(r'\s+', ' ', data["title"].strip().lower())
-        if normalized in seen_titles:
-            continue
-        seen_titles.add(normalized)
-        metadata.append(data)
-    save_json(metadata, "teikoku_metadata.json")
-    return metadata
+# ----- Teikoku Metadata -----
+SITE_SPECS["teikoku"] = {
+    "name": "Teikoku",
+    "discover": discover_teikoku,
+    "discover_rank": 6,
+    "unique_titles": True,
+    "file_key": "file",
+    "title": ["h1.entry-title"],
+    "date": [{"selector": DATE_SELECTOR, "attr": "datetime"}],
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_clean": [(DATELINE_PREFIX, "")],
+    "author": "Teikoku Pharma USA",
+    "containers": "div.wp-block-post-content, div.post-content, span.wp-block-paragraph",
+    "container_mode": "all",
+    "truncate": 750,
+}
 
 # ----- Treeway -----
-def scrape_treeway():
+def discover_treeway(driver):
     folder = "treeway_articles"
     os.makedirs(folder, exist_ok=True)
 
     base_url = "https://treeway.nl/news/"
-    driver.get(base_url)
-    time.sleep(3)
+    html = fetch_page("treeway", base_url, driver, "listing")
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = parse_html(html)
     article_links = soup.select("div.elementor-post__text a, article a")
 
     if not article_links:
         print("No articles found on the page.")
-        return
+        return []
 
     seen_links = set()
+    jobs = []
 
     for a in article_links:
         title = a.get_text(strip=True)
@@ -1003,119 +2762,49 @@ def scrape_treeway():
             continue
         seen_links.add(full_link)
 
-        driver.get(full_link)
-        time.sleep(2)
-
-        # Save HTML
+        # HTML is saved by the fetch stage
         safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
         html_path = os.path.join(folder, f"Treeway_{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+        jobs.append({"site": "treeway", "url": full_link, "title": title, "path": html_path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- Treeway Metadata -----
-def extract_treeway_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.entry-title, h1.post-title") or soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
+TREEWAY_DATELINE = re.compile(r"^[A-Z][a-zA-Z\s\-]+,\s+\d{1,2}\s+[A-Za-z]+\s+\d{4}")
+# "Mar 4 2024" or "March 4, 2024", any case; unlike SHORT_MONTH_DAY_YEAR, "Sept" is not a month here
+TREEWAY_DATE = re.compile(rf"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|{MONTHS})\s+\d{{1,2}},?\s+\d{{4}}",
+                          re.IGNORECASE)
 
-    # Date 
-    date = None
-
-    # Common date tags
-    date_tag = soup.select_one(
-        "time, .post-date, .entry-date, .elementor-post-date, span.published, strong"
-    )
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-        if date_text:
-            # Date cleaning
-            cleaned = re.sub(r"^[^A-Za-z]*,?\s*", "", date_text)
-            try:
-                parsed_date = dateparser.parse(cleaned, fuzzy=True)
-                if parsed_date:
-                    date = parsed_date.strftime("%Y-%m-%d")
-            except:
-                date = None
-
-    # Fallback
-    if not date:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|"
-            r"January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-            re.IGNORECASE
-        )
-        if match:
-            # Date cleaning
-            try:
-                cleaned = re.sub(r"^[^A-Za-z]*,?\s*", "", match.group(0))
-                parsed_date = dateparser.parse(cleaned, fuzzy=True)
-                if parsed_date:
-                    date = parsed_date.strftime("%Y-%m-%d")
-            except:
-                date = None
-
-    # Author
-    author = "Treeway"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author.get("content")
-
-    # Content
-    paragraphs = []
-    for container in soup.select("div.elementor-post-content, div.entry-content"):
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    content = "\n".join(paragraphs)
-
-    # Clean irrelevant text
+# Drops a "City, 4 March 2024" first line
+def drop_treeway_dateline(content):
     lines = content.splitlines()
-    if lines:
-        first_line = lines[0]
-        if re.match(r"^[A-Z][a-zA-Z\s\-]+,\s+\d{1,2}\s+[A-Za-z]+\s+\d{4}", first_line):
-            lines = lines[1:]
-    content = "\n".join(lines)
-
-    summary = content[:750] if content else None
-
-    return {
-        "file": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
-
-# Parse saved HTML
-def treeway_metadata(folder="treeway_articles"):
-    metadata = []
-    seen_titles = set()
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_treeway_content(path)
-        normalized = re.sub(r'\s+', ' ', data["title"].strip().lower())
-        if normalized in seen_titles:
-            continue
-        seen_titles.add(normalized)
-        metadata.append(data)
-    save_json(metadata, "treeway_metadata.json")
-    return metadata
+    if lines and TREEWAY_DATELINE.match(lines[0]):
+        lines = lines[1:]
+    return "\n".join(lines)
+
+SITE_SPECS["treeway"] = {
+    "name": "Treeway",
+    "discover": discover_treeway,
+    "discover_rank": 13,
+    "unique_titles": True,
+    "file_key": "file",
+    "title": ["h1.entry-title, h1.post-title", "title"],
+    "date": [{"selector": "time, .post-date, .entry-date, .elementor-post-date, span.published, strong",
+              "attr": "datetime"}],
+    "date_retry": True,
+    "date_scan": (TREEWAY_DATE,),
+    "date_scan_text": True,
+    "date_clean": [(r"^[^A-Za-z]*,?\s*", "")],
+    "author_meta": True,
+    "author": "Treeway",
+    "containers": "div.elementor-post-content, div.entry-content",
+    "container_mode": "all",
+    "cleanup": [drop_treeway_dateline],
+    "truncate": 750,
+}
 
 # ----- Annovis -----
-def scrape_annovis():
+def discover_annovis(driver):
     folder = "annovis_articles"
     os.makedirs(folder, exist_ok=True)
 
@@ -1123,12 +2812,12 @@ def scrape_annovis():
     url = base_url
     seen_links = set()
     page_num = 1
+    jobs = []
 
     while url:
-        driver.get(url)
-        time.sleep(3)
+        html = fetch_page("annovis", url, driver, "listing")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = parse_html(html)
 
         article_headers = soup.select("h5.blog-post-title")
 
@@ -1136,6 +2825,7 @@ def scrape_annovis():
             print("No articles found on this page.")
             break
 
+        page_start = len(jobs)
         for h5 in article_headers:
             title = h5.get_text(strip=True)
             a_tag = h5.find_parent("a") 
@@ -1148,128 +2838,63 @@ def scrape_annovis():
                 continue
             seen_links.add(full_link)
 
-            driver.get(full_link)
-            time.sleep(2)
-
-            # Saves HTML
+            # HTML is saved by the fetch stage
             safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
             html_path = os.path.join(folder, f"Annovis_{safe_title}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
+            jobs.append({"site": "annovis", "url": full_link, "title": title, "path": html_path})
 
-            print("Saved HTML:", title)
+        # Stops once a whole listing page was already crawled on an earlier run
+        page_urls = [urljoin(base_url, a.get("href")) for a in (h5.find_parent("a") for h5 in article_headers) if a and a.get("href")]
+        if listing_page_known("annovis", page_urls, jobs[page_start:]):
+            print("Annovis: reached articles from earlier runs, stopping.")
+            break
 
-        # Clicks next page button until no more pages 
+        # Follows the next page link until no more pages
         next_tag = soup.select_one("a.w-pagination-next[aria-label='Next Page']")
         if next_tag and next_tag.get("href"):
             url = urljoin(base_url, next_tag.get("href"))
             page_num += 1
-            time.sleep(1)
         else:
             break
 
-# ----- Annovis Metadata -----
-def extract_annovis_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h5.blog-post-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "").replace("_", " ")
-
-    # Date 
-    date_text = None
-
-    # Common date tags
-    date_tag = soup.select_one("time, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    # Try parsing the date
-    date = None
-    # Date cleaning
-    if date_text:
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", date_text)
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
-
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = "Annovis Bio"
+    return jobs
 
-    # Content
-    container = soup.select_one("div.blog-post-content, article, main") or soup
-    paragraphs = []
-
-    for p in container.find_all("p"):
-        text = p.get_text(" ", strip=True)
-        if not text:
-            continue
-
-        # Clean irrelevant text
-        text = re.sub(
-            r'^[A-Z][A-Z\s,.-]*,\s\w{3,9}\.?\s\d{1,2},\s?\d{4}.*?--.*?\)\s*,?\s*', 
-            '', 
-            text
-        )
-        text = re.sub(r'^\(NYSE: [A-Z]+\)\s*', '', text)
-
-        if text:
-            paragraphs.append(text)
-
-    content = " ".join(paragraphs)
-    content = re.sub(r'\n{2,}', '\n', content).strip()
-
-    summary = content[:750] if content else None
-
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
-
-# Parse saved HTML
-def annovis_metadata(folder="annovis_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_annovis_content(path)
-        metadata.append(data)
-    save_json(metadata, "annovis_metadata.json")
-    return metadata
+# ----- Annovis Metadata -----
+SITE_SPECS["annovis"] = {
+    "name": "Annovis",
+    "discover": discover_annovis,
+    "discover_rank": 7,
+    "file_key": "filename",
+    "title": ["h5.blog-post-title"],
+    "title_default": "name_spaces",
+    "date": [{"selector": DATE_SELECTOR, "attr": "datetime"}],
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_clean": [(DATELINE_PREFIX, "")],
+    "author": "Annovis Bio",
+    "containers": "div.blog-post-content, article, main",
+    "page_fallback": True,
+    # Press release datelines and the ticker at the start of a paragraph
+    "paragraph_filter": [
+        ("prefix", r'[A-Z][A-Z\s,.-]*,\s\w{3,9}\.?\s\d{1,2},\s?\d{4}.*?--.*?\)\s*,?\s*'),
+        ("prefix", r'\(NYSE: [A-Z]+\)\s*'),
+    ],
+    "join": " ",
+    "cleanup": [(r'\n{2,}', '\n'), str.strip],
+    "truncate": 750,
+}
 
 # ----- Stanford -----
-def scrape_stanford():
+def discover_stanford(driver):
     folder = "stanford_articles"
     os.makedirs(folder, exist_ok=True)
 
     base_url = "https://med.stanford.edu/adrc/news.html"
-    driver.get(base_url)
-    time.sleep(10)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page("stanford", base_url, driver, "listing")
+    soup = parse_html(html)
 
     article_links = soup.find_all("a", href=True)
 
+    jobs = []
     for a in article_links:
         href = a.get("href")
         if not href:
@@ -1279,136 +2904,58 @@ def scrape_stanford():
         if "alzheimer" not in full_link.lower():
             continue
 
-        driver.get(full_link)
-        time.sleep(10)
-
-        soup_article = BeautifulSoup(driver.page_source, "html.parser")
-        title_tag = soup_article.select_one("h1") or soup_article.find("title")
-        title = title_tag.get_text(strip=True) if title_tag else full_link
-
-        # Save HTML to folder
+        # HTML is saved to folder by save_stanford_page
         safe_link = re.sub(r'[^a-zA-Z0-9_-]', "_", full_link)
         html_path = os.path.join(folder, f"StanfordADRC_{safe_link}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-
-        print("Saved HTML:", title)
-
-# ----- Stanford Metadata -----
-def extract_stanford_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1")
-    if not title_tag:
-        title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "").replace("_", " ")
-
-    # Date
-    date_text = None
-    date_tag = soup.select_one(".news-date, time")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-    
-    if not date_text:
-        for tag in soup.find_all(["em", "strong", "p"]):
-            text = tag.get_text(" ", strip=True)
-            if re.search(
-                r"(January|February|March|April|May|June|July|August|September|October|November|December).*\d{4}",
-                text,
-            ):
-                date_text = text
-                break
-
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    date = None
-    if date_text:
-        cleaned = date_text.replace("\u2013", "-").replace("–", "-").replace("—", "-").strip()
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = pd.to_datetime(cleaned, errors="coerce")
-        if parsed_date is not None and not pd.isna(parsed_date):
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = "Stanford"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    elif soup.select_one(".author"):
-        author = soup.select_one(".author").get_text(strip=True)
-
-    # Content
-    content_containers = soup.select(".news-article, article, .content, main")
-    paragraphs = []
-    for container in content_containers:
-        for p in container.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    if not paragraphs:
-        for p in soup.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text:
-                paragraphs.append(text)
-
-    content = "\n".join(paragraphs)
-    summary = content[:750] if content else None
-
-    return {
-        "file": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": summary,
-        "content_source": "html"
-    }
-
-# Parse saved HTML
-def stanford_metadata(folder="stanford_articles"):
-    metadata = []
-    seen_titles = set()
+        jobs.append({"site": "stanford", "url": full_link, "title": None, "path": html_path})
 
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
+    return jobs
 
-        path = os.path.join(folder, file)
-        data = extract_stanford_content(path)
+def save_stanford_page(job, html):
+    soup_article = parse_fetched(html)
+    title_tag = soup_article.select_one("h1") or soup_article.find("title")
+    title = title_tag.get_text(strip=True) if title_tag else job["url"]
 
-        normalized_title = re.sub(r'\s+', ' ', data["title"].strip().lower())
-        if normalized_title in seen_titles:
-            continue
+    store_page("stanford", job["url"], job["path"], html)
 
-        seen_titles.add(normalized_title)
-        metadata.append(data)
+    print("Saved HTML:", title)
+    extracted_records[job["path"]] = extract_site("stanford", job["path"], soup_article)
+    return job["path"]
 
-    save_json(metadata, "stanford_metadata.json")
-    return metadata
+# ----- Stanford Metadata -----
+SITE_SPECS["stanford"] = {
+    "name": "Stanford",
+    "discover": discover_stanford,
+    "discover_rank": 1,
+    "save_page": save_stanford_page,
+    "unique_titles": True,
+    "file_key": "file",
+    "title": ["h1", "title"],
+    "title_default": "name_spaces",
+    "date": [{"selector": ".news-date, time", "attr": "datetime"}],
+    "date_blocks": (["em", "strong", "p"], MONTH_AND_YEAR),
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_scan_text": True,
+    "date_clean": [replace_dashes],
+    "author_meta": True,
+    "author_selector": ".author",
+    "author": "Stanford",
+    "containers": ".news-article, article, .content, main",
+    "container_mode": "all",
+    "page_fallback": True,
+    "truncate": 750,
+}
 
 # ----- Eisai -----
-def scrape_eisai():
+def discover_eisai(driver):
     base_url = "https://www.eisai.com/news/index.html"
     folder = "eisai_articles"
-    pdf_folder = "eisai_pdfs"
     os.makedirs(folder, exist_ok=True)
-    os.makedirs(pdf_folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(3)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page("eisai", base_url, driver, "listing")
+    soup = parse_html(html)
 
+    jobs = []
     for a_tag in soup.select("a.list-news-link"):
         title = a_tag.get_text(strip=True)
         href = a_tag.get("href")
@@ -1417,142 +2964,68 @@ def scrape_eisai():
         if not title or not full_link or "alzheimer" not in title.lower():
             continue
 
-        driver.get(full_link)
-        time.sleep(2)
-
-        # Save HTML
+        # HTML is saved by save_eisai_page
         safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
         html_path = os.path.join(folder, f"{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-
-        print("Saved HTML:", title)
-
-        # Downloads PDF when found
-        detail_soup = BeautifulSoup(driver.page_source, "html.parser")
-        pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
-        if not pdf_link_tag:
-            pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf$", re.I))
+        jobs.append({"site": "eisai", "url": full_link, "title": title, "path": html_path})
 
-        if pdf_link_tag and pdf_link_tag.get("href"):
-            pdf_url = urljoin(base_url, pdf_link_tag["href"])
-            pdf_filename = f"Eisai_{safe_title}.pdf"
-            pdf_path = os.path.join(pdf_folder, pdf_filename)
+    return jobs
 
-            try:
-                response = requests.get(pdf_url, timeout=15)
-                if response.status_code == 200:
-                    with open(pdf_path, "wb") as pdf_file:
-                        pdf_file.write(response.content)
-                else:
-                    print(f"Failed to download PDF ({response.status_code}): {pdf_url}")
-            except Exception as e:
-                print(f"Error downloading {pdf_url}: {e}")
-
-# ----- Eisai Metadata -----
-def extract_eisai_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1, h2, h3, .news-title")
-    title = title_tag.get_text(strip=True) if title_tag else None
+def save_eisai_page(job, html):
+    pdf_folder = "eisai_pdfs"
+    os.makedirs(pdf_folder, exist_ok=True)
+    save_article(job, html)
 
-    if not title:
-        head_title_tag = soup.find("title")
-        if head_title_tag and head_title_tag.get_text(strip=True):
-            title = head_title_tag.get_text(strip=True)
-        else:
-            title = os.path.basename(path).replace(".html", "")
-
-    # Date
-    date = None
-    date_text = None
-
-    time_tag = soup.select_one("time, .news-date")
-    if time_tag:
-        date_text = time_tag.get("datetime") or time_tag.get_text(" ", strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)\s+\d{1,2},?\s+\d{4}",
-            full_text,
-            flags=re.IGNORECASE,
-        )
-        if match:
-            date_text = match.group(0)
-        else:
-            match2 = re.search(
-                r"(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)\s+\d{4}",
-                full_text,
-                flags=re.IGNORECASE,
-            )
-            if match2:
-                date_text = match2.group(0)
-
-    if date_text:
-        date_text = date_text.replace("\u2013", "-").replace("–", "-").replace("—", "-").strip()
-        try:
-            parsed_date = dateparser.parse(date_text, fuzzy=True)
-            if parsed_date is not None:
-                date = parsed_date.strftime("%Y-%m-%d")
-        except Exception:
-            date = None
+    # Downloads PDF when found
+    safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", job["title"][:60])
+    detail_soup = parse_fetched(html)
+    pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
+    if not pdf_link_tag:
+        pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf$", re.I))
 
-    # Author
-    author = None
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
-    else:
-        author = "Eisai"
+    if pdf_link_tag and pdf_link_tag.get("href"):
+        pdf_url = urljoin(job["url"], pdf_link_tag["href"])
+        pdf_filename = f"Eisai_{safe_title}.pdf"
+        pdf_path = os.path.join(pdf_folder, pdf_filename)
 
-    # Content
-    article_container = soup.select_one("div.news-detail, .news-content, article")
-    content_container = article_container or soup
-    paragraphs = content_container.find_all("p")
-    content = "\n".join(p.get_text(" ", strip=True) for p in paragraphs if p.get_text(strip=True))
+        queue_pdf("eisai", pdf_url, pdf_path)
 
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "html",
-    }
+    extracted_records[job["path"]] = extract_site("eisai", job["path"], detail_soup)
+    return job["path"]
 
-# Parse saved HTML
-def eisai_metadata(folder="eisai_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_eisai_content(path)
-        metadata.append(data)
-    
-    save_json(metadata, "eisai_metadata.json")
-    return metadata
+# ----- Eisai Metadata -----
+SITE_SPECS["eisai"] = {
+    "name": "Eisai",
+    "discover": discover_eisai,
+    "discover_rank": 9,
+    "save_page": save_eisai_page,
+    "file_key": "filename",
+    "title": ["h1, h2, h3, .news-title", "title"],
+    "title_skip_empty": True,
+    "date": [{"selector": "time, .news-date", "attr": "datetime", "separator": " "}],
+    "date_scan": (SHORT_MONTH_DAY_YEAR, SHORT_MONTH_YEAR),
+    "date_clean": [replace_dashes],
+    "author_meta": True,
+    "author": "Eisai",
+    "containers": "div.news-detail, .news-content, article",
+    "page_fallback": True,
+}
 
 # ----- ABScience -----
 # To supress warnings
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
-def scrape_abscience():
+def discover_abscience(driver):
     base_url = "https://www.ab-science.com/news-and-media/press-releases/"
     html_folder = "abscience_articles"
     os.makedirs(html_folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
+    html = fetch_page("abscience", base_url, driver, "listing")
 
-    saved_articles = []
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = parse_html(html)
     articles = soup.select("h3.entry-title a")
 
+    jobs = []
     for a in articles:
         title = a.get_text(strip=True)
         href = urljoin(base_url, a.get("href"))
@@ -1560,123 +3033,130 @@ def scrape_abscience():
         if "alzheimer" not in title.lower():
             continue
 
-        driver.get(href)
-        time.sleep(2)
-        
-        # Save HTML
-        html_content = driver.page_source
+        # HTML and PDF are saved by save_abscience_page
         safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
         html_path = os.path.join(html_folder, f"ABScience_{safe_title}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        detail_soup = BeautifulSoup(html_content, "html.parser")
-
-        # PDF download and content extract
-        pdf_folder = "abscience_pdfs"
-        os.makedirs(pdf_folder, exist_ok=True)
-
-        pdf_path = None
-        content = None
-        pdf_tag = detail_soup.find("a", href=re.compile(r"\.pdf", re.I))
-        if pdf_tag and pdf_tag.get("href"):
-            pdf_url = urljoin(base_url, pdf_tag["href"])
-            pdf_path = os.path.join(pdf_folder, f"ABScience_{safe_title}.pdf")
-            try:
-                response = requests.get(pdf_url, timeout=10)
-                if response.status_code == 200:
-                    with open(pdf_path, "wb") as f:
-                        f.write(response.content)
-                    text = ""
-                    with pdfplumber.open(pdf_path) as pdf:
-                        for page in pdf.pages:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n\n"
-                    content = text.strip()[:750] if text else None
-            except Exception as e:
-                print("Error downloading or reading PDF:", e)
-
-        # Fallback if PDF missing
-        if not content:
-            paragraphs = detail_soup.select("div.entry-content p, article p")
-            html_text = " ".join([p.get_text(" ", strip=True) for p in paragraphs])
-            content = html_text[:750] if html_text else None
-
-        saved_articles.append({
-            "html_path": html_path,
-            "pdf_path": pdf_path,
-            "title": title,
-            "content": content
-        })
+        jobs.append({"site": "abscience", "url": href, "title": title, "path": html_path})
+
+    return jobs
+
+# First 750 characters of a PDF's text
+def pdf_text(data):
+    text = ""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n\n"
+    return text.strip()[:750] if text else None
+
+def abscience_page_text(detail_soup):
+    paragraphs = detail_soup.select("div.entry-content p, article p")
+    html_text = " ".join([p.get_text(" ", strip=True) for p in paragraphs])
+    return html_text[:750] if html_text else None
+
+# Returns the saved article dict that abscience_fetch_record makes its record from
+def save_abscience_page(job, html):
+    title = job["title"]
+    html_path = job["path"]
+    store_page("abscience", job["url"], html_path, html)
+
+    detail_soup = parse_fetched(html)
+
+    # PDF download and content extract
+    pdf_folder = "abscience_pdfs"
+    os.makedirs(pdf_folder, exist_ok=True)
 
-        print("Saved HTML:", title)
+    safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:60])
+    pdf_path = None
+    content = None
+    pdf_tag = detail_soup.find("a", href=re.compile(r"\.pdf", re.I))
+    if pdf_tag and pdf_tag.get("href"):
+        pdf_url = urljoin(job["url"], pdf_tag["href"])
+        pdf_path = os.path.join(pdf_folder, f"ABScience_{safe_title}.pdf")
+        try:
+            if download_pdf("abscience", pdf_url, pdf_path, timeout=10):
+                content = pdf_text(read_page_bytes(pdf_path))
+        except Exception as e:
+            print("Error downloading or reading PDF:", e)
 
-    return saved_articles
+    # Fallback if PDF missing
+    if not content:
+        content = abscience_page_text(detail_soup)
 
-# ----- ABScience Metadata -----
-def extract_abscience_content(article_dict):
-    html_path = article_dict["html_path"]
-    pdf_path = article_dict.get("pdf_path")
-    content = article_dict["content"]
-
-    with open(html_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1.entry-title") or soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(html_path)
-
-    # Date
-    date = None
-    article_tag = soup.select_one("article.post")
-    if article_tag and article_tag.get("data-date"):
-        try:
-            parsed = dateparser.parse(article_tag["data-date"], fuzzy=True)
-            date = parsed.strftime("%Y-%m-%d")
-        except:
-            pass
-    if not date:
-        date_tag = soup.select_one("time, .entry-date, .post-date")
-        if date_tag:
-            try:
-                date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-                parsed = dateparser.parse(date_text, fuzzy=True)
-                date = parsed.strftime("%Y-%m-%d")
-            except:
-                pass
-
-    # Author
-    author = "AB Science"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author.get("content")
+    print("Saved HTML:", title)
 
-    return {
-        "file": os.path.basename(html_path),
+    saved = {
+        "html_path": html_path,
+        "pdf_path": pdf_path,
         "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "pdf" if pdf_path else "html"
+        "content": content
     }
+    extracted_records[html_path] = extract_abscience_content(saved, detail_soup)
+    return saved
 
-# Saved metadata
-def abscience_metadata(saved_articles, json_file="abscience_metadata.json"):
-    metadata = [extract_abscience_content(a) for a in saved_articles]
-    save_json(metadata, json_file)
-    return metadata
+# ----- ABScience Metadata -----
+def extract_abscience_content(article_dict, soup=None):
+    record = extract_site("abscience", article_dict["html_path"], soup)
+    record["content"] = article_dict["content"]
+    record["content_source"] = "pdf" if article_dict.get("pdf_path") else "html"
+    return record
+
+# Same record as save_abscience_page makes, for a saved page: its PDF is found by link in the page store
+# or the archive being read
+def extract_saved_abscience(html_path, detail_soup=None):
+    detail_soup = detail_soup or parse_html(read_page(html_path))
+    pdf_path = None
+    content = None
+    pdf_tag = detail_soup.find("a", href=re.compile(r"\.pdf", re.I))
+    page_url = saved_url(html_path)
+    if pdf_tag and pdf_tag.get("href") and page_url:
+        pdf_path = saved_path("abscience", urljoin(page_url, pdf_tag["href"]))
+        if pdf_path:
+            try:
+                content = pdf_text(read_page_bytes(pdf_path))
+            except Exception as e:
+                print("Error reading PDF:", e)
+    if not content:
+        content = abscience_page_text(detail_soup)
+    saved = {"html_path": html_path, "pdf_path": pdf_path, "content": content}
+    return extract_abscience_content(saved, detail_soup)
+
+# Record of an article fetched this run, from save_abscience_page's result
+def abscience_fetch_record(saved):
+    return extracted_records.pop(saved["html_path"], None) or extract_abscience_content(saved)
+
+# Content comes from the PDF read at fetch time
+SITE_SPECS["abscience"] = {
+    "name": "ABScience",
+    "discover": discover_abscience,
+    "discover_rank": 10,
+    "save_page": save_abscience_page,
+    "extract": extract_saved_abscience,
+    "fetch_record": abscience_fetch_record,
+    "file_key": "file",
+    "title": ["h1.entry-title", "title"],
+    "title_default": "basename",
+    "date": [
+        {"selector": "article.post", "attr": "data-date", "text": False},
+        {"selector": "time, .entry-date, .post-date", "attr": "datetime"},
+    ],
+    "date_retry": True,
+    "author_meta": True,
+    "author": "AB Science",
+    "containers": None,
+}
 
 # ----- INmuneBio -----
-def scrape_inmunebio():
+def discover_inmunebio(driver):
     base_url = "https://www.inmunebio.com/index.php/newsroom/2025-news"
     folder = "inmunebio_articles"
     os.makedirs(folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page("inmunebio", base_url, driver, "listing")
+    soup = parse_html(html)
 
+    jobs = []
     articles = soup.select("p.news__title.textP")
     for p in articles:
         title = p.get_text(strip=True)
@@ -1688,105 +3168,46 @@ def scrape_inmunebio():
             continue
         href = urljoin(base_url, link_tag["href"])
 
-        driver.get(href)
-        time.sleep(2)
-
-        # Save HTML to folder
+        # HTML is saved to folder by the fetch stage
         safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:100])
         path = os.path.join(folder, f"{safe_title}.html")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+        jobs.append({"site": "inmunebio", "url": href, "title": title, "path": path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- INmuneBio Metadata -----
-def extract_inmunebio_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("p.news__title.textP, h1, .title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date
-    date_text = None
-    date_tag = soup.select_one("time, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-
-    # Fallback
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)"
-            r"\s+\d{1,2},?\s+\d{4}",
-            full_text,
-        )
-        if match:
-            date_text = match.group(0)
-
-    date = None
-    if date_text:
-        cleaned = re.sub(r"^[^A-Za-z]*(?:[A-Za-z\s,]+[-–—]\s*)?", "", date_text)
-        try:
-            parsed_date = dateparser.parse(cleaned, fuzzy=True)
-        except Exception:
-            parsed_date = None
-        if parsed_date:
-            date = parsed_date.strftime("%Y-%m-%d")
-
-    # Author
-    author = "INmune Bio"
-
-    # Content
-    article_container = soup.select_one("article, main, .content, .news-detail") or soup
-    paragraphs = article_container.find_all("p")
-    content = "\n".join(p.get_text(" ", strip=True) for p in paragraphs if p.get_text(strip=True))
-
-    # Clean unwanted sections
-    patterns_to_remove = [
-        r"Recent News",
-        r"Read More",
-        r"Select News Releases",
-        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}, \s*\d{4}\b"
-    ]
-    for pattern in patterns_to_remove:
-        content = re.sub(pattern, "", content, flags=re.IGNORECASE)
-
-    content = re.sub(r"\n{2,}", "\n\n", content).strip()
-
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "html",
-    }
-
-# Parse saved HTML
-def inmunebio_metadata(folder="inmunebio_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_inmunebio_content(path)
-        metadata.append(data)
-    save_json(metadata, "inmunebio_metadata.json")
-    return metadata
+SITE_SPECS["inmunebio"] = {
+    "name": "INmuneBio",
+    "discover": discover_inmunebio,
+    "discover_rank": 14,
+    "file_key": "filename",
+    "title": ["p.news__title.textP, h1, .title"],
+    "date": [{"selector": DATE_SELECTOR, "attr": "datetime"}],
+    "date_scan": (MONTH_DAY_YEAR,),
+    "date_clean": [(DATELINE_PREFIX, "")],
+    "author": "INmune Bio",
+    "containers": "article, main, .content, .news-detail",
+    "page_fallback": True,
+    "content_filter": [
+        ("drop", r"Recent News", re.IGNORECASE),
+        ("drop", r"Read More", re.IGNORECASE),
+        ("drop", r"Select News Releases", re.IGNORECASE),
+        ("drop", r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}, \s*\d{4}\b", re.IGNORECASE),
+    ],
+    "cleanup": [(r"\n{2,}", "\n\n"), str.strip],
+}
 
 # ----- Vandria -----
-def scrape_vandria():
+def discover_vandria(driver):
     base_url = "https://vandria.com/news/"
     folder = "vandria_articles"
     os.makedirs(folder, exist_ok=True)
 
-    driver.get(base_url)
-    time.sleep(2)
+    html = fetch_page("vandria", base_url, driver, "listing")
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = parse_html(html)
     seen_urls = set()
+    jobs = []
 
     for a in soup.select("a.title"):
         title = a.get_text(strip=True)
@@ -1801,91 +3222,47 @@ def scrape_vandria():
             continue
         seen_urls.add(href)
 
-        driver.get(href)
-        time.sleep(2)
-
         # Use URL hash for filename
         url_hash = hashlib.md5(href.encode("utf-8")).hexdigest()[:12]
         safe_title = re.sub(r"[^a-zA-Z0-9_-]", "_", title[:40])
         filename = f"{safe_title}_{url_hash}.html"
 
         html_path = os.path.join(folder, filename)
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+        jobs.append({"site": "vandria", "url": href, "title": title, "path": html_path})
 
-        print("Saved HTML:", title)
+    return jobs
 
 # ----- Vandria Metadata -----
-def extract_vandria_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1, h2, .entry-title, .et_pb_title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date
-    date_tag = soup.find("time")
-    date = date_tag.get_text(strip=True) if date_tag else None
-
-    # Author
-    author = "Vandria"
-
-    # Content
-    article_container = soup.select_one("article, .entry-content, main, .post")
-    content_container = article_container or soup
-    paragraphs = content_container.find_all("p")
-    content = "\n".join(p.get_text(" ", strip=True) for p in paragraphs if p.get_text(strip=True))
-
-    # Clean irrelevant text
-    content = re.sub(r"(Recent News.*)$", "", content, flags=re.DOTALL | re.IGNORECASE)
-    content = re.sub(r"\n{2,}", "\n\n", content).strip()
-
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "html"
-    }
-
-# Parse saved HMTL
-def vandria_metadata(folder="vandria_articles"):
-    metadata = []
-    seen_titles = set()
-
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_vandria_content(path)
-
-        # Removed duplicate in JSON file
-        if data["title"] in seen_titles:
-            continue
-        seen_titles.add(data["title"])
-
-        metadata.append(data)
-
-    save_json(metadata, "vandria_metadata.json")
-    return metadata
+SITE_SPECS["vandria"] = {
+    "name": "Vandria",
+    "discover": discover_vandria,
+    "discover_rank": 15,
+    "unique_titles": "exact",
+    "file_key": "filename",
+    "title": ["h1, h2, .entry-title, .et_pb_title"],
+    "date": [{"selector": "time"}],
+    "normalize_date": False,
+    "author": "Vandria",
+    "containers": "article, .entry-content, main, .post",
+    "page_fallback": True,
+    "content_filter": [("cut", r"Recent News", re.IGNORECASE)],
+    "cleanup": [(r"\n{2,}", "\n\n"), str.strip],
+}
 
 # ----- Priavoid -----
-def scrape_priavoid():
+def discover_priavoid(driver):
     base_url = "https://priavoid.com/news-and-events/"
     folder = "priavoid_articles"
-    pdf_folder = "priavoid_pdfs"
     os.makedirs(folder, exist_ok=True)
-    os.makedirs(pdf_folder, exist_ok=True)
 
     page_url = base_url 
+    jobs = []
 
     while page_url: 
-        driver.get(page_url)
-        time.sleep(3)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        html = fetch_page("priavoid", page_url, driver, "listing")
+        soup = parse_html(html)
 
+        page_start = len(jobs)
         for h3 in soup.find_all("h3"):
             title = h3.get_text(strip=True)
             link_tag = h3.find("a", href=True)
@@ -1894,35 +3271,16 @@ def scrape_priavoid():
             if not title or not href or "alzheimer" not in title.lower():
                 continue
 
-            driver.get(href)
-            time.sleep(2)
-
-            # Save HTML
+            # HTML and PDF are saved by save_priavoid_page
             safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", title[:60])
             html_path = os.path.join(folder, f"{safe_title}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            print("Saved HTML:", title)
-
-            # Download PDFs 
-            detail_soup = BeautifulSoup(driver.page_source, "html.parser")
-            pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
-            if not pdf_link_tag:
-                pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf$", re.I))
-
-            if pdf_link_tag and pdf_link_tag.get("href"):
-                pdf_url = urljoin(base_url, pdf_link_tag["href"])
-                pdf_filename = f"Priavoid_{safe_title}.pdf"
-                pdf_path = os.path.join(pdf_folder, pdf_filename)
-                try:
-                    response = requests.get(pdf_url, timeout=15)
-                    if response.status_code == 200:
-                        with open(pdf_path, "wb") as pdf_file:
-                            pdf_file.write(response.content)
-                    else:
-                        print(f"Failed to download PDF ({response.status_code}): {pdf_url}")
-                except Exception as e:
-                    print(f"Error downloading {pdf_url}: {e}")
+            jobs.append({"site": "priavoid", "url": href, "title": title, "path": html_path})
+
+        # Stops once a whole listing page was already crawled on an earlier run
+        page_urls = [urljoin(base_url, a["href"]) for a in (h3.find("a", href=True) for h3 in soup.find_all("h3")) if a]
+        if listing_page_known("priavoid", page_urls, jobs[page_start:]):
+            print("Priavoid: reached articles from earlier runs, stopping.")
+            break
 
         # Next page
         next_btn = soup.find("a", class_="pagination-next", rel="next")
@@ -1931,160 +3289,466 @@ def scrape_priavoid():
         else:
             page_url = None
 
-# ----- Priavoid Metadata -----
-def extract_priavoid_content(path):
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    # Title
-    title_tag = soup.select_one("h1, h2, h3, .entry-title")
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(path).replace(".html", "")
-
-    # Date
-    date_text = None
-    date_tag = soup.select_one("time.entry-date, .post-date, .entry-date, .elementor-post-date")
-    if date_tag:
-        date_text = date_tag.get("datetime") or date_tag.get_text(strip=True)
-    if not date_text:
-        full_text = soup.get_text(" ", strip=True)
-        match = re.search(
-            r"(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)\s+\d{1,2},?\s+\d{4}",
-            full_text,
-            flags=re.IGNORECASE,
-        )
-        if match:
-            date_text = match.group(0)
-    date = None
-    if date_text:
-        try:
-            parsed_date = dateparser.parse(date_text, fuzzy=True)
-            date = parsed_date.strftime("%Y-%m-%d")
-        except Exception:
-            date = None
+    return jobs
 
-    # Author
-    author = "Priavoid"
-    meta_author = soup.find("meta", attrs={"name": "author"})
-    if meta_author and meta_author.get("content"):
-        author = meta_author["content"]
+def save_priavoid_page(job, html):
+    pdf_folder = "priavoid_pdfs"
+    os.makedirs(pdf_folder, exist_ok=True)
+    save_article(job, html)
 
-    # Content
-    article_container = soup.select_one("article, main, .entry-content")
-    content_container = article_container or soup
-    paragraphs = content_container.find_all("p")
-    clean_paragraphs = []
+    # Download PDFs 
+    safe_title = re.sub(r'[^a-zA-Z0-9_-]', "_", job["title"][:60])
+    detail_soup = parse_fetched(html)
+    pdf_link_tag = detail_soup.find("a", string=re.compile(r"Download", re.I))
+    if not pdf_link_tag:
+        pdf_link_tag = detail_soup.find("a", href=re.compile(r"\.pdf$", re.I))
 
-    # Clean irrelevant text
-    for p in paragraphs:
-        text = p.get_text(" ", strip=True)
-        if not text:
-            continue
-        if re.fullmatch(r'[\d\n\s,.-]+', text):
-            continue
-        try:
-            dateparser.parse(text, fuzzy=False)
-            continue
-        except (ValueError, OverflowError):
-            pass
-        if re.match(
-            r"^[A-Za-zäöüÄÖÜß\s\-]+,\s*[A-Za-z\s\-]*,\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?\s+\d{1,2},?\s+\d{4}",
-            text
-        ):
-            continue
-        clean_paragraphs.append(text)
+    if pdf_link_tag and pdf_link_tag.get("href"):
+        pdf_url = urljoin(job["url"], pdf_link_tag["href"])
+        pdf_filename = f"Priavoid_{safe_title}.pdf"
+        pdf_path = os.path.join(pdf_folder, pdf_filename)
+        queue_pdf("priavoid", pdf_url, pdf_path)
 
-    content = "\n".join(clean_paragraphs)
-    content = re.sub(r"(Contact Information.*|Forward[- ]Looking Statements.*|Related Posts.*|Recent News.*)", "", content, flags=re.DOTALL | re.IGNORECASE)
-    content = re.sub(r"\n{2,}", "\n\n", content).strip()
+    extracted_records[job["path"]] = extract_site("priavoid", job["path"], detail_soup)
+    return job["path"]
 
-    return {
-        "filename": os.path.basename(path),
-        "title": title,
-        "date": date,
-        "author": author,
-        "content": content,
-        "content_source": "html",
-    }
+# ----- Priavoid Metadata -----
+PRIAVOID_DATELINE = re.compile(
+    r"^[A-Za-zäöüÄÖÜß\s\-]+,\s*[A-Za-z\s\-]*,\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?\s+\d{1,2},?\s+\d{4}"
+)
+
+SITE_SPECS["priavoid"] = {
+    "name": "Priavoid",
+    "discover": discover_priavoid,
+    "discover_rank": 8,
+    "save_page": save_priavoid_page,
+    "file_key": "filename",
+    "title": ["h1, h2, h3, .entry-title"],
+    "date": [{"selector": "time.entry-date, .post-date, .entry-date, .elementor-post-date", "attr": "datetime"}],
+    "date_scan": (SHORT_MONTH_DAY_YEAR,),
+    "date_scan_text": True,
+    "author_meta": True,
+    "author": "Priavoid",
+    "containers": "article, main, .entry-content",
+    "page_fallback": True,
+    # Paragraphs that are only numbers, only a date, or a press release dateline
+    "drop_paragraphs": ("numbers", "date", "dateline"),
+    "dateline": PRIAVOID_DATELINE,
+    "content_filter": [
+        ("cut", r"Contact Information", re.IGNORECASE),
+        ("cut", r"Forward[- ]Looking Statements", re.IGNORECASE),
+        ("cut", r"Related Posts", re.IGNORECASE),
+        ("cut", r"Recent News", re.IGNORECASE),
+    ],
+    "cleanup": [(r"\n{2,}", "\n\n"), str.strip],
+}
+
+# ----- FETCH QUEUE -----
+# Article jobs waiting to be downloaded, each URL is queued only once
+# Thread workers call get() until it returns None, async code takes everything with drain()
+class FetchQueue:
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    # Returns False when the URL was already queued
+    def put(self, job):
+        with self.lock:
+            if job["url"] in self.seen:
+                return False
+            self.seen.add(job["url"])
+        self.jobs.put(job)
+        return True
+
+    def extend(self, jobs):
+        return sum(self.put(job) for job in jobs)
+
+    # Next job, or None once the queue is empty
+    def get(self):
+        try:
+            return self.jobs.get_nowait()
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        jobs = []
+        job = self.get()
+        while job is not None:
+            jobs.append(job)
+            job = self.get()
+        return jobs
+
+    def __len__(self):
+        return self.jobs.qsize()
+
+# ----- LINK DISCOVERY -----
+# Slowest sites first so they start while the quick ones fill the other drivers
+DISCOVERERS = [spec["discover"] for spec in sorted(SITE_SPECS.values(),
+                                                   key=lambda spec: spec.get("discover_rank", len(SITE_SPECS)))]
+
+# Crawls every site's listing pages at once and returns a FetchQueue of the articles still to download
+# Sites with browser-rendered listings hold a pooled driver while crawling, the rest only borrow one if HTTP fails
+def discover_articles(pool, discoverers=DISCOVERERS):
+    def run(discover):
+        site = discover.__name__.replace("discover_", "", 1)
+        try:
+            if fetch_mode(site, "listing") == "http":
+                jobs = discover(None)
+            else:
+                with pool.acquire() as driver:
+                    jobs = discover(driver)
+        except Exception:
+            finish_listing(site, completed=False)
+            raise
+        finish_listing(site, completed=True)
+        return jobs
+
+    found = {}
+    with ThreadPoolExecutor(max_workers=len(discoverers)) as executor:
+        futures = {executor.submit(run, discover): discover.__name__ for discover in discoverers}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                found[name] = future.result()
+                print(f"{name} found {len(found[name])} articles.")
+            except Exception as e:
+                print(f"{name} failed: {e}")
+
+    # Keeps the DISCOVERERS order so runs are repeatable
+    jobs = [job for discover in discoverers for job in found.get(discover.__name__, [])]
+    fetch_queue = FetchQueue()
+    fetch_queue.extend(pending_jobs(jobs))
+    return fetch_queue
+
+# ----- ASYNC ARTICLE FETCH -----
+# Article pages of all sites download concurrently, at most PER_HOST_LIMIT at a time per host
+PER_HOST_LIMIT = int(os.environ.get("SCRAPER_PER_HOST", "4"))
+FETCH_THREADS = 32
+
+# Saves a fetched article under the path chosen during discovery
+def save_article(job, html):
+    store_page(job["site"], job["url"], job["path"], html)
+    print("Saved HTML:", job["title"])
+    return job["path"]
+
+# Pages, bytes, errors and first start / last finish time per site
+fetch_stats = {}
+
+async def fetch_article(job, host_limits):
+    site = job["site"]
+    stats = fetch_stats.setdefault(site, {"pages": 0, "bytes": 0, "errors": 0, "start": None, "end": None})
+    limit = host_limits.setdefault(urlparse(job["url"]).netloc, asyncio.Semaphore(PER_HOST_LIMIT))
+
+    result = None
+    try:
+        async with limit:
+            if stats["start"] is None:
+                stats["start"] = time.perf_counter()
+            html, headers = await asyncio.to_thread(fetch_response, site, job["url"])
+        if run_archive is not None:
+            response_headers[job["url"]] = headers
+        # Saving and parsing run in a worker thread so the event loop keeps fetching
+        # Sites with a save_page do more than save the page (title check on the article, PDFs)
+        handler = SITE_SPECS[site].get("save_page", save_article)
+        result = await asyncio.to_thread(handler, job, html)
+        await asyncio.to_thread(mark_fetched, site, job["url"])
+        stats["pages"] += 1
+        stats["bytes"] += len(html.encode("utf-8"))
+    except Exception as e:
+        stats["errors"] += 1
+        print(f"Error fetching {job['url']}: {e}")
+    stats["end"] = time.perf_counter()
+    return result
+
+async def fetch_all_articles(jobs):
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=FETCH_THREADS))
+    host_limits = {}
+    return await asyncio.gather(*(fetch_article(job, host_limits) for job in jobs))
+
+# Prints pages, errors and throughput per site
+def fetch_report(total_seconds):
+    for site, stats in sorted(fetch_stats.items()):
+        seconds = (stats["end"] - stats["start"]) if stats["start"] else 0
+        rate = stats["pages"] / seconds if seconds else 0
+        kb_rate = stats["bytes"] / 1024 / seconds if seconds else 0
+        print(f"{site}: {stats['pages']} pages, {stats['errors']} errors in {seconds:.1f}s "
+              f"({rate:.2f} pages/s, {kb_rate:.0f} KB/s)")
+    print(f"Fetched {sum(s['pages'] for s in fetch_stats.values())} articles in {total_seconds:.1f}s")
+
+# Downloads every queued job and returns the non-empty handler results grouped by site
+def fetch_articles(fetch_queue):
+    start = time.perf_counter()
+    jobs = fetch_queue.drain()
+    results = asyncio.run(fetch_all_articles(jobs))
+    pdf_count = wait_for_pdfs()
+    fetch_report(time.perf_counter() - start)
+    print(f"Downloaded {pdf_count} PDFs")
+
+    site_results = {}
+    for job, result in zip(jobs, results):
+        if result is not None:
+            site_results.setdefault(job["site"], []).append(result)
+    return site_results
+
+# ----- PARSER BENCHMARK -----
+def saved_pages():
+    pages = []
+    for site in SITE_SPECS:
+        folder = site_folder(site)
+        pages += [(site, os.path.join(folder, file)) for file in list_pages(folder) if file.endswith(".html")]
+    return pages
+
+# Re-extracts every saved article with each parser, prints docs/sec and the records that differ from html.parser
+# Run with: python -c "import proj7; proj7.parser_benchmark()"
+def parser_benchmark(parsers=None, filename="parser_benchmark.json"):
+    global HTML_PARSER
+    pages = saved_pages()
+    parsers = parsers or AVAILABLE_PARSERS
+    default_parser = HTML_PARSER
+    outputs = {}
+    report = {}
+    try:
+        for parser in ["html.parser"] + [p for p in parsers if p != "html.parser"]:
+            HTML_PARSER = parser
+            date_cache.clear()
+            start = time.perf_counter()
+            outputs[parser] = [extract_article(site, path) for site, path in pages]
+            seconds = time.perf_counter() - start
+            report[parser] = {"docs": len(pages), "seconds": round(seconds, 3),
+                              "docs_per_sec": round(len(pages) / seconds, 1) if seconds else None, "differences": []}
+    finally:
+        HTML_PARSER = default_parser
+
+    for parser, records in outputs.items():
+        for (site, path), record, expected in zip(pages, records, outputs["html.parser"]):
+            fields = [key for key in expected if record.get(key) != expected[key]]
+            if fields:
+                report[parser]["differences"].append({"site": site, "file": path, "fields": fields})
+
+    for parser in parsers:
+        stats = report[parser]
+        print(f"{parser}: {stats['docs']} docs in {stats['seconds']}s ({stats['docs_per_sec']} docs/s), "
+              f"{len(stats['differences'])} differ from html.parser")
+    save_json(report, filename)
+    return report
+
+# Extracts the saved articles of every site with regions with and without partial parsing
+# Prints the time of both and any records that differ, which means a site's regions are missing something
+def partial_parse_check(filename="partial_parse_check.json"):
+    global PARTIAL_PARSING
+    pages = [(site, path) for site, path in saved_pages() if site_spec(site)["regions"]]
+    default = PARTIAL_PARSING
+    outputs = {}
+    timings = {}
+    try:
+        for partial in (False, True):
+            PARTIAL_PARSING = partial
+            date_cache.clear()
+            start = time.perf_counter()
+            outputs[partial] = [extract_article(site, path) for site, path in pages]
+            timings[partial] = time.perf_counter() - start
+    finally:
+        PARTIAL_PARSING = default
+
+    differences = [{"site": site, "file": path, "fields": [key for key in full if full[key] != partial.get(key)]}
+                   for (site, path), full, partial in zip(pages, outputs[False], outputs[True]) if full != partial]
+    print(f"{len(pages)} docs: full parse {timings[False]:.2f}s, partial parse {timings[True]:.2f}s, "
+          f"{len(differences)} differ")
+    save_json({"docs": len(pages), "full_seconds": round(timings[False], 3),
+               "partial_seconds": round(timings[True], 3), "differences": differences}, filename)
+    return differences
+
+# Extracts every saved article with the single page walk and with one search per field
+# Prints the time of both and any records that differ
+# Run with: python -c "import proj7; proj7.single_pass_check()"
+def single_pass_check(filename="single_pass_check.json"):
+    global SINGLE_PASS
+    pages = saved_pages()
+    soups = [(site, path, *read_site_html(site, path)) for site, path in pages]
+    default = SINGLE_PASS
+    outputs = {}
+    timings = {}
+    try:
+        for single_pass in (False, True):
+            SINGLE_PASS = single_pass
+            date_cache.clear()
+            start = time.perf_counter()
+            outputs[single_pass] = [extract_site(site, path, soup, partial) for site, path, soup, partial in soups]
+            timings[single_pass] = time.perf_counter() - start
+    finally:
+        SINGLE_PASS = default
+
+    differences = [{"site": site, "file": path, "fields": [key for key in searched if searched[key] != walked.get(key)]}
+                   for (site, path), searched, walked in zip(pages, outputs[False], outputs[True]) if searched != walked]
+    print(f"{len(pages)} docs: field searches {timings[False]:.2f}s, single pass {timings[True]:.2f}s, "
+          f"{len(differences)} differ")
+    save_json({"docs": len(pages), "search_seconds": round(timings[False], 3),
+               "single_pass_seconds": round(timings[True], 3), "differences": differences}, filename)
+    return differences
+
+# Extracts the saved pages of every site with a save_page twice: from the page as it was fetched, the way
+# the fetch handlers do, and from the saved copy the way site_metadata does
+# Any record that differs would be written to the metadata store as changed on every run
+# Run with: python -c "import proj7; proj7.crawl_record_check()"
+def crawl_record_check(filename="crawl_record_check.json"):
+    pages = [(site, path) for site, path in saved_pages() if "save_page" in SITE_SPECS[site]]
+    differences = []
+    for site, path in pages:
+        fetched = extract_article(site, path, parse_fetched(read_page_bytes(path).decode("utf-8")))
+        saved = extract_article(site, path)
+        if fetched != saved:
+            differences.append({"site": site, "file": path,
+                                "fields": [key for key in saved if saved[key] != fetched.get(key)]})
+    print(f"{len(pages)} docs: {len(differences)} differ between the fetched and the saved page")
+    save_json({"docs": len(pages), "differences": differences}, filename)
+    return differences
+
+# ----- PARALLEL EXTRACTION -----
+# Saved articles are extracted in one process pool, a batch of files per task, while site_metadata
+# writes the records: each site's batches are handed out a few at a time and read back in file order,
+# so only the batches in flight are kept in memory
+EXTRACT_WORKERS = int(os.environ.get("SCRAPER_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+EXTRACT_BATCH_SIZE = 20
+# Batches per worker submitted ahead of the one being written
+EXTRACT_AHEAD = 2
+
+extract_pool = None
+
+# Runs in a worker process; the date and cleanup counters of the batch are sent back with its records
+def extract_batch(site, paths):
+    date_stats.clear()
+    date_parse_stats.clear()
+    cleanup_stats.clear()
+    records = [(path, extract_article(site, path)) for path in paths]
+    return records, date_stats, date_parse_stats, cleanup_stats
+
+def merge_counts(totals, counts):
+    for site, stats in counts.items():
+        site_totals = totals.setdefault(site, {})
+        for key, count in stats.items():
+            site_totals[key] = site_totals.get(key, 0) + count
+
+def batch_records(future):
+    records, strategy_counts, parse_counts, rule_counts = future.result()
+    merge_counts(date_stats, strategy_counts)
+    merge_counts(date_parse_stats, parse_counts)
+    merge_counts(cleanup_stats, rule_counts)
+    return dict(records)
+
+# Records of a site's saved articles in file name order; pages parsed at fetch time already have one
+def site_records(site, folder):
+    paths = [os.path.join(folder, file) for file in list_pages(folder) if file.endswith(".html")]
+    if extract_pool is None:
+        for path in paths:
+            yield extracted_records.pop(path, None) or extract_article(site, path)
+        return
 
-# Parse saved HTML
-def priavoid_metadata(folder="priavoid_articles"):
-    metadata = []
-    for file in os.listdir(folder):
-        if not file.endswith(".html"):
-            continue
-        path = os.path.join(folder, file)
-        data = extract_priavoid_content(path)
+    pending = [path for path in paths if path not in extracted_records]
+    batches = iter([pending[i:i + EXTRACT_BATCH_SIZE] for i in range(0, len(pending), EXTRACT_BATCH_SIZE)])
+    in_flight = deque()
+
+    def submit():
+        batch = next(batches, None)
+        if batch:
+            in_flight.append(extract_pool.submit(extract_batch, site, batch))
+
+    for _ in range(EXTRACT_AHEAD * EXTRACT_WORKERS):
+        submit()
+    records = {}
+    for path in paths:
+        record = extracted_records.pop(path, None)
+        if record is None:
+            if path not in records:
+                records = batch_records(in_flight.popleft())
+                submit()
+            record = records.pop(path)
+        yield record
+
+# Writes a site's <site>_metadata.jsonl and metadata store rows and returns how many articles it wrote
+# Sites with a fetch_record are written from this run's fetched results when main passes them
+def site_metadata(site, fetched=None, json_file=None):
+    spec = SITE_SPECS[site]
+    folder = site_folder(site)
+    metadata = MetadataWriter(site, folder, json_file)
+    if "fetch_record" in spec and fetched is not None:
+        records = (spec["fetch_record"](result) for result in fetched.get(site, []))
+    else:
+        records = site_records(site, folder)
+    unique_titles = spec.get("unique_titles")
+    seen_titles = set()
+    for data in records:
+        if unique_titles:
+            title = data["title"] if unique_titles == "exact" else re.sub(r"\s+", " ", data["title"].strip().lower())
+            if title in seen_titles:
+                continue
+            seen_titles.add(title)
         metadata.append(data)
-    save_json(metadata, "priavoid_metadata.json")
-    return metadata
+    return metadata.close()
+
+# Extracts the saved articles of every site and writes each site's file as its records come in
+# main passes this run's fetch results per site; without them every site's saved pages are read
+def extract_saved_articles(fetched=None, workers=EXTRACT_WORKERS):
+    global extract_pool
+    start = time.perf_counter()
+    if workers > 1:
+        # spawn starts clean workers instead of forking a process that has browser and download threads
+        context = multiprocessing.get_context("spawn")
+        archive_path = archive_reader["path"] if archive_reader is not None else None
+        extract_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                           initializer=use_archive, initargs=(archive_path,))
+    saved = 0
+    try:
+        for site, spec in SITE_SPECS.items():
+            saved += site_metadata(site, fetched)
+            print(f"{spec['name']} JSON saved.")
+    finally:
+        if extract_pool is not None:
+            extract_pool.shutdown(cancel_futures=True)
+            extract_pool = None
+
+    seconds = time.perf_counter() - start
+    rate = saved / seconds if seconds else 0
+    print(f"Extracted and saved {saved} articles in {seconds:.1f}s ({rate:.1f} docs/s, {max(workers, 1)} workers)")
 
 # ----- MAIN FUNCTION -----
 def main():
-    # Runs all scrapers
-    scrape_igcpharma()
-    scrape_asceneuron()
-    scrape_aprinoia()
-    scrape_ucdavis()
-    scrape_agenebio()
-    scrape_usc()
-    scrape_teikoku()
-    scrape_treeway()
-    scrape_annovis()
-    scrape_stanford()
-    scrape_eisai()
-    scrape_inmunebio()
-    scrape_vandria()
-    scrape_priavoid()
-
-    # Needed for downloaded files
-    saved_articles = scrape_abscience()
-
-    # Extract metadata and save JSON
-    igcpharma_metadata()
-    print("IGC Pharma JSON saved.")
-
-    asceneuron_metadata()
-    print("AsceNeuron JSON saved.")
-
-    aprinoia_metadata()
-    print("Aprinoia JSON saved.")    
-    
-    ucdavis_metadata()
-    print("UC Davis JSON saved.")
-
-    agenebio_metadata()
-    print("AGeneBio JSON saved.") 
-
-    usc_metadata()
-    print("USC JSON saved.")
-
-    teikoku_metadata()
-    print("Teikoku JSON saved.")
-
-    treeway_metadata()
-    print("Treeway JSON saved.")
-
-    annovis_metadata()
-    print("Annovis JSON saved.")
-
-    stanford_metadata()
-    print("Stanford JSON saved.")
-
-    eisai_metadata()
-    print("Eisai JSON saved.")
+    if RUN_ARCHIVE:
+        start_run_archive()
+
+    # Finds articles on every site, then downloads them all at once
+    start = time.perf_counter()
+    fetch_queue = discover_articles(driver_pool)
+    print(f"Found {len(fetch_queue)} articles on {len(DISCOVERERS)} sites in {time.perf_counter() - start:.1f}s")
+    results = fetch_articles(fetch_queue)
+    close_run_archive()
+
+    # Extract metadata from every saved article, saving JSON per site as it goes
+    # Sites with a fetch_record need this run's results (downloaded files)
+    extract_saved_articles(results)
+
+    # One typed dataset of every site's articles for analysis
+    if pyarrow is not None:
+        export_parquet()
+    else:
+        print("pyarrow is not installed, skipping the Parquet export.")
 
-    abscience_metadata(saved_articles) 
-    print("ABScience JSON saved.")
+    # Time spent waiting for pages per site
+    wait_report()
 
-    inmunebio_metadata()
-    print("INmuneBio JSON saved.")
+    # Browser traffic loaded and blocked per site
+    resource_report()
 
-    vandria_metadata()
-    print("Vandria JSON saved.")
+    # Listing pages and PDFs answered from the HTTP cache
+    cache_report()
 
-    priavoid_metadata()
-    print("Priavoid JSON saved.")
+    # How dates were found on pages without a date element
+    date_report()
+    cleanup_report()
+    store_report()
+    metadata_report()
     
-    driver.quit()
+    driver_pool.close()
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import pytest
+
+import proj7
+
+# A news article with the elements the site specs look for, and text outside them
+ARTICLE = """<html><head><title>Alzheimer study | News</title><meta name="author" content="Jane Doe">
+<script>var published = "January 1, 2020";</script></head>
+<body><header><h2>Menu</h2><p>Recent News</p></header>
+<article class="post"{article_date}><h1 class="entry-title">Alzheimer trial results</h1>
+<h5 class="blog-post-title">Alzheimer trial results</h5>{date}
+<span class="author">Jane Doe</span>
+<div class="entry-content blog-post-content news-detail"><p>NEW YORK, March 4, 2024 -- First paragraph about Alzheimer.</p>
+<p><strong>March 4, 2024</strong></p><p>Second <em>paragraph</em> about the trial.</p><ul><li>Point one</li></ul></div>
+</article>
+<aside><p>Related Posts</p><p>Sidebar text.</p></aside><footer>Posted March 5, 2024</footer></body></html>"""
+
+FIXTURES = {
+    "date_element": ARTICLE.format(article_date=' data-date="2024-03-04"',
+                                   date='<time class="entry-date" datetime="2024-03-04">March 4, 2024</time>'),
+    "empty_date_element": ARTICLE.format(article_date="", date='<time class="entry-date"></time>'),
+    "no_date_element": ARTICLE.format(article_date="", date=""),
+}
+
+PARTIAL_SITES = [site for site in proj7.SITE_SPECS if proj7.site_spec(site)["regions"]]
+
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+@pytest.mark.parametrize("site", PARTIAL_SITES)
+def test_partial_parse_matches_full_parse(tmp_path, monkeypatch, site, fixture):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / f"{site}_{fixture}.html"
+    path.write_text(FIXTURES[fixture], encoding="utf-8")
+
+    partial = proj7.extract_site(site, str(path))
+    full = proj7.extract_site(site, str(path), proj7.parse_html(FIXTURES[fixture]))
+    assert partial == full
+
+
+@pytest.mark.skipif(proj7.ElementFilter is None, reason="partial parsing needs beautifulsoup4 4.13+")
+def test_pages_without_date_element_are_parsed_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "page.html"
+    path.write_text(FIXTURES["no_date_element"], encoding="utf-8")
+    assert proj7.read_site_html("teikoku", str(path))[1] is False
+
+    path.write_text(FIXTURES["date_element"], encoding="utf-8")
+    soup, partial = proj7.read_site_html("teikoku", str(path))
+    assert partial is True
+    assert soup.find("footer") is None